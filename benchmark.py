@@ -3,6 +3,7 @@ import random
 import os
 import shutil
 from src.storage_engine.engine import StorageEngine
+from src.storage_engine.config import StorageConfig, COMPACTION_LEVELED, COMPACTION_TIERED
 
 
 # Configuration
@@ -10,17 +11,25 @@ NUM_RECORDS = 100_000
 KEY_SIZE = 16 # bytes
 VAL_SIZE = 100 # bytes
 DB_PATH = "benchmark_data"
+STRATEGIES = [COMPACTION_LEVELED, COMPACTION_TIERED]
 
 def run_benchmark():
     print(f"--- Iron-Python Storage Engine Benchmark ---")
     print(f"Records: {NUM_RECORDS}")
     print(f"Payload: {KEY_SIZE} byte keys, {VAL_SIZE} byte values")
 
+    for strategy in STRATEGIES:
+        run_strategy(strategy)
+
+def run_strategy(strategy):
+    print(f"\n=== Compaction Strategy: {strategy} ===")
+
     # Clean up previous runs
     if os.path.exists(DB_PATH):
         shutil.rmtree(DB_PATH)
 
-    engine = StorageEngine(DB_PATH, memtable_max_size=1000)
+    config = StorageConfig(compaction_strategy=strategy)
+    engine = StorageEngine(DB_PATH, memtable_max_size=1000, config=config)
 
     # 1. WRITE BENCHMARK
     print("\n[Phase 1] Writing Data...")
@@ -38,6 +47,8 @@ def run_benchmark():
     duration = end_time - start_time
     writes_per_sec = NUM_RECORDS / duration
     print(f"-> Write Result: {writes_per_sec:.2f} ops/sec")
+    print(f"-> Write Amplification: {engine.stats.write_amplification:.2f}x "
+          f"({engine.stats.compactions} compactions)")
 
     # 2. READ BENCHMARK (Random Access)
     print("\n[Phase 2] Reading Data (Random Access)...")
@@ -0,0 +1,67 @@
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+from src.storage_engine.blob.pointer import BlobPointer
+
+
+class BlobGarbageCollector:
+    """
+    Works out which blob files can be reclaimed.
+
+    A blob file is dead once no SSTable references it anymore (not even a
+    shadowed, older version). Files whose live values make up less than
+    `1 - garbage_ratio` of their size are worth relocating: the live values
+    are rewritten elsewhere, and once compaction has dropped the old
+    pointers the file becomes dead and is deleted on a later pass.
+    """
+
+    def __init__(self, garbage_ratio: float = 0.5):
+        self.garbage_ratio = garbage_ratio
+
+    def collect(self, readers: Iterable, shadowed_keys: Set[str], blob_sizes: Dict[int, int],
+                is_expired: Optional[Callable[[BlobPointer], bool]] = None
+                ) -> Tuple[List[int], Dict[int, List[Tuple[str, BlobPointer]]]]:
+        """
+        Args:
+            readers: Live SSTables ordered newest -> oldest.
+            shadowed_keys: Keys with a newer version in RAM (MemTables).
+            blob_sizes: Size in bytes of every live blob file, by file number.
+            is_expired: Optional TTL check. Expired values still pin their
+                        file (until compaction drops them) but count as
+                        garbage and are never relocated.
+
+        Returns:
+            (dead_files, relocations) where relocations maps a blob file number
+            to the (key, pointer) pairs still live in it.
+        """
+        referenced: Set[int] = set()
+        live_bytes: Dict[int, int] = {}
+        live: Dict[int, List[Tuple[str, BlobPointer]]] = {}
+        seen = set(shadowed_keys)
+
+        for reader in readers:
+            for key, value in reader:
+                if key in seen:
+                    # Older version: it pins the file, but its bytes are garbage
+                    if isinstance(value, BlobPointer):
+                        referenced.add(value.file_number)
+                    continue
+                seen.add(key)
+                if isinstance(value, BlobPointer):
+                    referenced.add(value.file_number)
+                    if is_expired is not None and is_expired(value):
+                        continue
+                    # Record framing: [KeyLen][Key][ValLen] + value
+                    live_bytes[value.file_number] = live_bytes.get(value.file_number, 0) + \
+                        8 + len(key.encode('utf-8')) + value.length
+                    live.setdefault(value.file_number, []).append((key, value))
+
+        dead = [number for number in blob_sizes if number not in referenced]
+
+        relocations = {}
+        for number, size in blob_sizes.items():
+            if number not in live or size == 0:
+                continue
+            garbage = 1 - live_bytes[number] / size
+            if garbage >= self.garbage_ratio:
+                relocations[number] = live[number]
+
+        return dead, relocations
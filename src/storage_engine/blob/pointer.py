@@ -0,0 +1,45 @@
+import struct
+
+
+# Set on an SSTable record's value length when the value is a BlobPointer
+# rather than inline data. Inline values must stay below 2 GiB.
+BLOB_FLAG = 0x80000000
+
+
+class BlobPointer:
+    """
+    Location of a value stored in a blob file.
+
+    Attributes:
+        file_number: Number of the blob file (e.g. 12 -> "000012.blob").
+        offset: Byte offset of the value inside the file.
+        length: Size of the encoded value in bytes.
+    """
+    __slots__ = ('file_number', 'offset', 'length')
+
+    # [File Number (8B)][Offset (8B)][Length (4B)]
+    FORMAT = '>QQI'
+    SIZE = struct.calcsize(FORMAT)
+
+    def __init__(self, file_number: int, offset: int, length: int):
+        self.file_number = file_number
+        self.offset = offset
+        self.length = length
+
+    def encode(self) -> bytes:
+        return struct.pack(self.FORMAT, self.file_number, self.offset, self.length)
+
+    @classmethod
+    def decode(cls, data: bytes) -> 'BlobPointer':
+        return cls(*struct.unpack(cls.FORMAT, data))
+
+    def __eq__(self, other):
+        if not isinstance(other, BlobPointer):
+            return NotImplemented
+        return (self.file_number, self.offset, self.length) == (other.file_number, other.offset, other.length)
+
+    def __hash__(self):
+        return hash((self.file_number, self.offset, self.length))
+
+    def __repr__(self):
+        return f"BlobPointer(file={self.file_number}, offset={self.offset}, length={self.length})"
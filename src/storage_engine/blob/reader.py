@@ -0,0 +1,20 @@
+import mmap
+import os
+from src.storage_engine.blob.pointer import BlobPointer
+
+
+class BlobFileReader:
+    """Resolves BlobPointers using Memory-Mapped I/O (one mapping per blob file)."""
+    def __init__(self, filepath: str, file_number: int):
+        self.filepath = filepath
+        self.file_number = file_number
+        self.file = open(filepath, "rb")
+        self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.file_size = os.path.getsize(filepath)
+
+    def read(self, pointer: BlobPointer) -> str:
+        return self.mm[pointer.offset : pointer.offset + pointer.length].decode('utf-8')
+
+    def close(self):
+        self.mm.close()
+        self.file.close()
@@ -0,0 +1,33 @@
+import struct
+from src.storage_engine.blob.pointer import BlobPointer
+
+
+class BlobFileWriter:
+    """
+    Appends large values to an immutable blob file.
+    Format: [Key Size (4B)][Key][Value Size (4B)][Value] (same framing as SSTables),
+    so the garbage collector can tell which key a value belongs to.
+    """
+
+    def __init__(self, filepath: str, file_number: int):
+        self.filepath = filepath
+        self.file_number = file_number
+        self.file = open(filepath, "wb")
+        self.offset = 0
+
+    def add(self, key: str, value: str) -> BlobPointer:
+        """Appends a record and returns a pointer to its value."""
+        key_bytes = key.encode('utf-8')
+        val_bytes = value.encode('utf-8')
+
+        self.file.write(struct.pack('>I', len(key_bytes)))
+        self.file.write(key_bytes)
+        self.file.write(struct.pack('>I', len(val_bytes)))
+        self.file.write(val_bytes)
+
+        value_offset = self.offset + 8 + len(key_bytes)
+        self.offset = value_offset + len(val_bytes)
+        return BlobPointer(self.file_number, value_offset, len(val_bytes))
+
+    def close(self) -> None:
+        self.file.close()
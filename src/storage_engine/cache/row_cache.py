@@ -0,0 +1,81 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+
+class RowCache:
+    """
+    LRU cache of fully resolved point-lookup results, bounded in bytes.
+
+    Entries map a key to whatever the engine's read path produced for it,
+    including None for keys that don't exist (negative entries), so hot
+    misses skip the SSTable probes as well. The engine invalidates a key on
+    every write to it.
+    """
+
+    # Rough per-entry bookkeeping cost (OrderedDict node, tuple, ints)
+    ENTRY_OVERHEAD = 64
+
+    def __init__(self, capacity_bytes: int):
+        self.capacity = capacity_bytes
+        self.usage = 0
+        self._entries: 'OrderedDict[str, Tuple[Any, int]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Stats
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get(self, key: str) -> Tuple[bool, Optional[Any]]:
+        """Returns (found, entry). `found` distinguishes a cached None from a miss."""
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            if item[0] is None:
+                self.negative_hits += 1
+            return True, item[0]
+
+    def put(self, key: str, entry: Optional[Any], size: int = 0) -> None:
+        """
+        Args:
+            entry: Value to cache, or None for a negative entry.
+            size: Bytes held by the entry besides the key.
+        """
+        charge = len(key) + size + self.ENTRY_OVERHEAD
+        if charge > self.capacity:
+            return
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (entry, charge)
+            self.usage += charge
+            # Evict least recently used entries until we fit
+            while self.usage > self.capacity:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.usage -= evicted
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.usage = 0
+
+    def _remove(self, key: str) -> None:
+        item = self._entries.pop(key, None)
+        if item is not None:
+            self.usage -= item[1]
+
+    def __len__(self):
+        return len(self._entries)
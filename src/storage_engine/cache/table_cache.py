@@ -0,0 +1,94 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict
+
+
+class _Entry:
+    __slots__ = ('handle', 'pins', 'retired')
+
+    def __init__(self, handle: Any):
+        self.handle = handle
+        self.pins = 0
+        self.retired = False
+
+
+class TableCache:
+    """
+    LRU of open SSTable handles (file descriptor, plus the mapping in mmap
+    mode), bounded by the number of open files.
+
+    Readers pin their handle for the duration of a lookup or scan. Pinned
+    handles are never closed: if every handle is pinned the cache briefly
+    exceeds its capacity and shrinks again once they are released, and a
+    handle evicted while pinned is closed by its last release.
+    """
+
+    def __init__(self, max_open_files: int):
+        self.capacity = max_open_files
+        self._entries: 'OrderedDict[str, _Entry]' = OrderedDict()
+        self._pinned: Dict[int, _Entry] = {} # id(handle) -> entry
+        self._lock = threading.Lock()
+
+        # Stats
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def acquire(self, path: str, opener: Callable[[], Any]) -> Any:
+        """Returns the open handle for path, opening it with `opener` on a miss, and pins it."""
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None:
+                self._entries.move_to_end(path)
+                self.hits += 1
+            else:
+                self.misses += 1
+                entry = _Entry(opener())
+                self._entries[path] = entry
+            entry.pins += 1
+            self._pinned[id(entry.handle)] = entry
+            self._shrink()
+            return entry.handle
+
+    def release(self, handle: Any) -> None:
+        """Unpins a handle returned by `acquire`."""
+        with self._lock:
+            entry = self._pinned[id(handle)]
+            entry.pins -= 1
+            if entry.pins == 0:
+                del self._pinned[id(handle)]
+                if entry.retired:
+                    entry.handle.close()
+            self._shrink()
+
+    def evict(self, path: str) -> None:
+        """Closes the handle of a table that is being deleted (once unpinned)."""
+        with self._lock:
+            entry = self._entries.pop(path, None)
+            if entry is None:
+                return
+            if entry.pins:
+                entry.retired = True
+            else:
+                entry.handle.close()
+
+    def clear(self) -> None:
+        """Closes every handle (the owning engine is shutting down)."""
+        with self._lock:
+            for entry in self._entries.values():
+                entry.handle.close()
+            self._entries.clear()
+            self._pinned.clear()
+
+    def _shrink(self) -> None:
+        """Closes least recently used, unpinned handles until within capacity."""
+        if len(self._entries) <= self.capacity:
+            return
+        for path in [p for p, entry in self._entries.items() if entry.pins == 0]:
+            if len(self._entries) <= self.capacity:
+                break
+            self._entries.pop(path).handle.close()
+            self.evictions += 1
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,52 @@
+import time
+from typing import Callable, Optional, Tuple
+from src.storage_engine import ttl
+
+
+# Decisions a CompactionFilter can return for a key
+KEEP = "keep"
+REMOVE = "remove"
+CHANGE_VALUE = "change_value"
+
+
+class CompactionFilter:
+    """
+    Hook invoked by Compactor for every key that survives deduplication.
+
+    Subclasses override `filter` and return one of:
+        (KEEP, None)               -> write the entry unchanged
+        (REMOVE, None)             -> drop the entry
+        (CHANGE_VALUE, new_value)  -> write `new_value` instead
+
+    REMOVE is only honoured when the merge includes the oldest data for the
+    key range (bottommost). Otherwise an older version in a table outside
+    the merge would become visible again, so the entry is kept.
+    """
+
+    def filter(self, key: str, value: str) -> Tuple[str, Optional[str]]:
+        return KEEP, None
+
+
+class TtlCompactionFilter(CompactionFilter):
+    """
+    Drops values whose TTL has passed, then hands live values (without their
+    expiry prefix) to an optional inner filter. A value rewritten by the inner
+    filter keeps its original expiry.
+    """
+
+    def __init__(self, inner: Optional[CompactionFilter] = None,
+                 clock: Callable[[], float] = time.time):
+        self.inner = inner
+        self.clock = clock
+
+    def filter(self, key: str, value: str) -> Tuple[str, Optional[str]]:
+        expires_at, user_value = ttl.decode(value)
+        if ttl.is_expired(expires_at, self.clock()):
+            return REMOVE, None
+        if self.inner is None:
+            return KEEP, None
+
+        decision, new_value = self.inner.filter(key, user_value)
+        if decision == CHANGE_VALUE:
+            return CHANGE_VALUE, ttl.encode(new_value, expires_at)
+        return decision, new_value
@@ -1,8 +1,13 @@
 import heapq
 import os
-from typing import List
+from typing import Callable, List, Optional
+from src.storage_engine.config import READ_MODE_MMAP
 from src.storage_engine.sstable.reader import SSTableReader
+from src.storage_engine.cache.table_cache import TableCache
 from src.storage_engine.sstable.writer import SSTableWriter
+from src.storage_engine.rate_limiter import RateLimiter, IO_PRIORITY_LOW
+from src.storage_engine.compaction.filter import CompactionFilter, REMOVE, CHANGE_VALUE
+from src.storage_engine.blob.pointer import BlobPointer
 from src.storage_engine.memtable.skiplist import SkipList # Used only for typing if needed
 
 
@@ -12,17 +17,47 @@ class Compactor:
     discarding overwritten keys (garbage collection).
     """
 
-    def merge(self, input_paths: List[str], output_path: str) -> None:
+    def __init__(self, rate_limiter: Optional[RateLimiter] = None,
+                 compaction_filter: Optional[CompactionFilter] = None,
+                 blob_resolver: Optional[Callable[[BlobPointer], str]] = None,
+                 read_mode: str = READ_MODE_MMAP, table_cache: Optional[TableCache] = None):
+        """
+        Args:
+            rate_limiter: Optional token bucket shared with flushes. Compaction
+                          writes are requested at low priority.
+            compaction_filter: Optional hook deciding, per surviving key, whether
+                          to keep, drop or rewrite the value.
+            blob_resolver: Loads values stored in blob files. Only needed with a
+                          compaction filter: otherwise BlobPointers are copied
+                          through and the value bytes are never rewritten.
+            read_mode: How input tables are read ("mmap" or "pread"). Inputs
+                          are hinted for sequential access.
+            table_cache: If set, inputs borrow (and pin) their handles from it,
+                          so a merge counts against the open-file limit.
+        """
+        self.rate_limiter = rate_limiter
+        self.compaction_filter = compaction_filter
+        self.blob_resolver = blob_resolver
+        self.read_mode = read_mode
+        self.table_cache = table_cache
+
+    def merge(self, input_paths: List[str], output_path: str, bottommost: bool = True) -> List[str]:
         """
         Args:
             input_paths: List of paths to existing .sst files (ordered oldest to newest).
             output_path: Destination for the merged file.
+            bottommost: True if no older table outside `input_paths` can hold
+                        these keys. Filter removals are only applied then.
+
+        Returns:
+            Keys the compaction filter dropped or rewrote (their visible value
+            may have changed, so caches must forget them).
         """
         readers = []
         try:
             # 1. Open all files as iterators
             for path in input_paths:
-                readers.append(SSTableReader(path))
+                readers.append(SSTableReader(path, read_mode=self.read_mode, table_cache=self.table_cache))
 
             # 2. Create a merged iterator
             # We assume input_paths are sorted by age.
@@ -34,13 +69,13 @@ class Compactor:
             # Simple approach: Load all iteratores into a generator that yields sorted (key, value)
             merged_iter = heapq.merge(*readers, key=lambda x: x[0])
 
-            self._write_merged(merged_iter, output_path)
+            return self._write_merged(merged_iter, output_path, bottommost)
 
         finally:
             for r in readers:
                 r.close()
     
-    def _write_merged(self, iterator, output_path):
+    def _write_merged(self, iterator, output_path, bottommost=True):
         """Consumes the sorted iterator, deduplicates keys, and writes to disk."""
         # We can reuse the logic from SSTableWriter if we adapt the interface,
         # or write raw bytes here. Reusing Writer is cleaner but Writer expects a SkipList.
@@ -50,7 +85,8 @@ class Compactor:
 
         # We use a trick: We wrap the raw writing logic.
         # But wait, SSTableWriter._write_pair is available.
-        writer = SSTableWriter()
+        writer = SSTableWriter(rate_limiter=self.rate_limiter, io_priority=IO_PRIORITY_LOW)
+        changed = []
 
         with open(output_path, "wb") as f:
             last_key = None
@@ -65,11 +101,31 @@ class Compactor:
                 else:
                     # New key encountered. Flush the previous one if it exists.
                     if last_key is not None:
-                        writer._write_pair(f, last_key, last_val)
+                        self._write_filtered(writer, f, last_key, last_val, bottommost, changed)
 
                     last_key = key
                     last_val = val
 
             # Don't forget the final key
             if last_key is not None:
-                writer._write_pair(f, last_key, last_val)
+                self._write_filtered(writer, f, last_key, last_val, bottommost, changed)
+
+        writer._drain()
+        return changed
+
+    def _write_filtered(self, writer, file_obj, key, val, bottommost, changed):
+        """Runs the compaction filter on a surviving key, then writes what it decided."""
+        if self.compaction_filter is not None:
+            # Filters always see the real value; a kept blob stays a pointer
+            user_val = val
+            if isinstance(val, BlobPointer):
+                user_val = self.blob_resolver(val)
+            decision, new_val = self.compaction_filter.filter(key, user_val)
+            if decision == REMOVE and bottommost:
+                changed.append(key)
+                return
+            if decision == CHANGE_VALUE:
+                changed.append(key)
+                val = new_val
+
+        writer._write_pair(file_obj, key, val)
@@ -0,0 +1,136 @@
+from typing import List, Optional, Sequence
+from src.storage_engine.config import (
+    StorageConfig,
+    COMPACTION_LEVELED,
+    COMPACTION_TIERED,
+)
+
+
+class CompactionJob:
+    """
+    A unit of work picked by a strategy.
+
+    Attributes:
+        inputs: Tables to merge, ordered oldest to newest (the order Compactor expects).
+        output_level: Level that receives the merged table.
+    """
+    __slots__ = ('inputs', 'output_level')
+
+    def __init__(self, inputs: List, output_level: int):
+        self.inputs = inputs
+        self.output_level = output_level
+
+    def __repr__(self):
+        return f"CompactionJob(inputs={len(self.inputs)}, output_level={self.output_level})"
+
+
+class CompactionStrategy:
+    """
+    Decides which tables to merge next.
+
+    Strategies only look at `filepath` and `file_size` of the tables in each
+    level. Level 0 holds freshly flushed tables (oldest to newest); every
+    deeper level is older than the one above it.
+    """
+
+    def pick(self, levels: Sequence[List]) -> Optional[CompactionJob]:
+        raise NotImplementedError
+
+    def estimate_pending_bytes(self, levels: Sequence[List]) -> int:
+        """Compaction debt: bytes the next picked job would have to rewrite."""
+        job = self.pick(levels)
+        if job is None:
+            return 0
+        return sum(t.file_size for t in job.inputs)
+
+
+class LeveledCompactionStrategy(CompactionStrategy):
+    """
+    Every level below L0 is a single sorted run with a target size that grows
+    geometrically. Good read amplification, but the same bytes are rewritten
+    once per level they pass through.
+    """
+
+    def __init__(self, config: StorageConfig):
+        self.l0_trigger = config.level0_file_num_compaction_trigger
+        self.level_base = config.max_bytes_for_level_base
+        self.multiplier = config.max_bytes_for_level_multiplier
+
+    def max_bytes_for_level(self, level: int) -> int:
+        return self.level_base * (self.multiplier ** (level - 1))
+
+    def pick(self, levels: Sequence[List]) -> Optional[CompactionJob]:
+        # 1. Too many overlapping L0 files: push them all into L1.
+        if len(levels[0]) >= self.l0_trigger:
+            l1 = levels[1] if len(levels) > 1 else []
+            return CompactionJob(list(l1) + list(levels[0]), output_level=1)
+
+        # 2. A level outgrew its target: merge it into the next one.
+        for level in range(1, len(levels)):
+            size = sum(t.file_size for t in levels[level])
+            if size > self.max_bytes_for_level(level):
+                below = levels[level + 1] if level + 1 < len(levels) else []
+                return CompactionJob(list(below) + list(levels[level]), output_level=level + 1)
+
+        return None
+
+
+class TieredCompactionStrategy(CompactionStrategy):
+    """
+    Universal compaction: all sorted runs live in L0 and runs of similar size
+    are merged together. Each byte is rewritten roughly log(N) times instead
+    of once per level, trading read and space amplification for writes.
+    """
+
+    def __init__(self, config: StorageConfig):
+        self.trigger = config.level0_file_num_compaction_trigger
+        self.size_ratio = config.size_ratio
+        self.min_width = max(2, config.min_merge_width)
+        self.max_width = max(self.min_width, config.max_merge_width)
+        self.max_space_amp = config.max_size_amplification_percent
+
+    def pick(self, levels: Sequence[List]) -> Optional[CompactionJob]:
+        runs = levels[0]
+        if len(runs) < max(2, self.trigger):
+            return None
+
+        # 1. Space amplification: the newer runs are too large compared to the
+        # oldest (which approximates the live data set). Merge everything.
+        oldest = runs[0].file_size
+        newer = sum(r.file_size for r in runs[1:])
+        if newer * 100 > self.max_space_amp * oldest:
+            return CompactionJob(list(runs), output_level=0)
+
+        # 2. Size ratio: starting from a run (newest first), keep adding older
+        # runs while they are not much bigger than what has been picked so far.
+        for start in range(len(runs) - 1, 0, -1):
+            picked = 1
+            total = runs[start].file_size
+            for run in reversed(runs[:start]):
+                if picked >= self.max_width:
+                    break
+                if run.file_size * 100 > total * (100 + self.size_ratio):
+                    break
+                picked += 1
+                total += run.file_size
+
+            if picked >= self.min_width:
+                return CompactionJob(list(runs[start - picked + 1:start + 1]), output_level=0)
+
+        # 3. More runs than the trigger but none similar enough: merge the
+        # newest ones regardless of size, back down to the trigger. Otherwise
+        # a write stop on the run count would wait for a job that never comes.
+        if len(runs) > self.trigger:
+            width = min(self.max_width, max(self.min_width, len(runs) - self.trigger + 1))
+            return CompactionJob(list(runs[-width:]), output_level=0)
+
+        return None
+
+
+def create_compaction_strategy(config: StorageConfig) -> CompactionStrategy:
+    """Builds the strategy named in the config."""
+    if config.compaction_strategy == COMPACTION_LEVELED:
+        return LeveledCompactionStrategy(config)
+    if config.compaction_strategy == COMPACTION_TIERED:
+        return TieredCompactionStrategy(config)
+    raise ValueError(f"Unknown compaction strategy: {config.compaction_strategy!r}")
@@ -0,0 +1,115 @@
+from dataclasses import dataclass
+from typing import Optional
+from src.storage_engine.compaction.filter import CompactionFilter
+
+
+# Compaction strategies understood by the engine.
+COMPACTION_LEVELED = "leveled"
+COMPACTION_TIERED = "tiered"
+
+# How SSTable bytes are read.
+READ_MODE_MMAP = "mmap"
+READ_MODE_PREAD = "pread"
+
+
+@dataclass
+class StorageConfig:
+    """
+    Tunables for a single StorageEngine instance.
+
+    Attributes:
+        compaction_strategy: "leveled" (low read amplification) or
+                             "tiered" (low write amplification, a.k.a. universal).
+        level0_file_num_compaction_trigger: Number of freshly flushed SSTables
+                             (sorted runs for tiered) that triggers a compaction.
+        max_bytes_for_level_base: Target size of level 1 (leveled only).
+        max_bytes_for_level_multiplier: Growth factor between levels (leveled only).
+        size_ratio: Percentage slack when comparing run sizes (tiered only).
+                    A run joins the merge if it is at most (100 + size_ratio)%
+                    of the runs already picked.
+        min_merge_width: Minimum number of runs merged at once (tiered only).
+        max_merge_width: Maximum number of runs merged at once (tiered only).
+        max_size_amplification_percent: Triggers a full merge when the newer
+                    runs exceed this percentage of the oldest run (tiered only).
+        rate_limit_bytes_per_sec: Shared write budget for flush and compaction
+                    (0 disables rate limiting). Flushes preempt compactions.
+        rate_limit_auto_tuned: Treat the budget as a ceiling and adjust the
+                    actual rate to follow compaction debt.
+        background_jobs: Run flushes and compactions on background threads.
+                    When False, `put` pays for them inline (the default).
+        level0_slowdown_writes_trigger / level0_stop_writes_trigger:
+                    L0 file counts at which writes are delayed / stopped.
+        immutable_memtable_slowdown_trigger / immutable_memtable_stop_trigger:
+                    Number of MemTables waiting to be flushed.
+        soft_pending_compaction_bytes_limit / hard_pending_compaction_bytes_limit:
+                    Estimated compaction debt.
+        max_write_delay: Per-write delay (seconds) just below a stop threshold.
+                    Write stalls only apply when background_jobs is enabled.
+        compaction_filter: Hook called by compaction for every surviving key
+                    to keep, drop or rewrite its value.
+        ttl_enabled: Store an expiry time with every value. Expired values are
+                    hidden from reads and dropped by compaction.
+        default_ttl: TTL in seconds for `put` calls that don't pass one
+                    (None = never expire).
+        enable_blob_files: Key-value separation. Values of at least
+                    `min_blob_size` bytes are written to blob files at flush
+                    time and SSTables only keep a pointer, so compaction never
+                    rewrites them.
+        min_blob_size: Encoded value size (bytes) that goes to a blob file.
+        blob_gc_garbage_ratio: Fraction of dead bytes at which the blob
+                    garbage collector relocates a blob file's live values.
+        row_cache_size: Capacity in bytes of the LRU cache of point-lookup
+                    results, negative ones included (0 disables it).
+        max_open_files: Upper bound on SSTables holding an open file
+                    descriptor (and mapping). Least recently used tables are
+                    closed and reopened on demand (0 keeps every table open).
+                    Compaction inputs share the cache, but a merge needs all
+                    its inputs open at once, so while one runs the count can
+                    exceed the limit by up to its number of inputs.
+                    Read-only instances ignore it and keep tables open.
+        sstable_read_mode: "mmap" maps each table into memory; "pread" reads
+                    blocks with os.pread and needs no address space.
+    """
+    compaction_strategy: str = COMPACTION_LEVELED
+    level0_file_num_compaction_trigger: int = 4
+
+    # Leveled
+    max_bytes_for_level_base: int = 1024 * 1024
+    max_bytes_for_level_multiplier: int = 10
+
+    # Tiered / Universal
+    size_ratio: int = 1
+    min_merge_width: int = 2
+    max_merge_width: int = 32
+    max_size_amplification_percent: int = 200
+
+    # I/O rate limiting
+    rate_limit_bytes_per_sec: int = 0
+    rate_limit_auto_tuned: bool = False
+
+    # Background work and write stalls
+    background_jobs: bool = False
+    level0_slowdown_writes_trigger: int = 20
+    level0_stop_writes_trigger: int = 36
+    immutable_memtable_slowdown_trigger: int = 2
+    immutable_memtable_stop_trigger: int = 4
+    soft_pending_compaction_bytes_limit: int = 64 * 1024 * 1024
+    hard_pending_compaction_bytes_limit: int = 256 * 1024 * 1024
+    max_write_delay: float = 0.05
+
+    # Compaction filters and TTL
+    compaction_filter: Optional[CompactionFilter] = None
+    ttl_enabled: bool = False
+    default_ttl: Optional[float] = None
+
+    # Key-value separation (blob files)
+    enable_blob_files: bool = False
+    min_blob_size: int = 512
+    blob_gc_garbage_ratio: float = 0.5
+
+    # Caching
+    row_cache_size: int = 0
+    max_open_files: int = 0
+
+    # SSTable I/O
+    sstable_read_mode: str = READ_MODE_MMAP
@@ -1,51 +1,278 @@
 import os
 import glob
+import shutil
+import threading
 import time
-from typing import Optional, List
+from typing import Dict, Optional, List, Tuple, Union
+from src.storage_engine import ttl as ttl_codec
+from src.storage_engine.config import StorageConfig
+from src.storage_engine.manifest import Manifest
+from src.storage_engine.stats import EngineStats
+from src.storage_engine.rate_limiter import RateLimiter
+from src.storage_engine.write_controller import WriteController
 from src.storage_engine.memtable.skiplist import SkipList
 from src.storage_engine.wal.logger import WALLogger
+from src.storage_engine.wal.reader import WALReader
 from src.storage_engine.sstable.writer import SSTableWriter
 from src.storage_engine.sstable.reader import SSTableReader
+from src.storage_engine.compaction.merger import Compactor
+from src.storage_engine.compaction.strategy import CompactionJob, create_compaction_strategy
+from src.storage_engine.compaction.filter import TtlCompactionFilter
+from src.storage_engine.blob.pointer import BlobPointer
+from src.storage_engine.blob.writer import BlobFileWriter
+from src.storage_engine.blob.reader import BlobFileReader
+from src.storage_engine.blob.gc import BlobGarbageCollector
+from src.storage_engine.cache.row_cache import RowCache
+from src.storage_engine.cache.table_cache import TableCache
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory file locks
+    fcntl = None
 
 
 class StorageEngine:
     """
     The main entry point for the database.
     Coordinates the MemTable (RAM) and WAL (Disk).
+
+    One process opens a directory as the primary (holding its LOCK file).
+    Any number of others may open it read-only, see `open_read_only` and
+    `open_as_secondary`.
     """
-    def __init__(self, dir_path: str = "data", memtable_max_size: int = 3):
+    LOCK_NAME = "LOCK"
+
+    # How often a secondary retries a catch-up that raced with the primary
+    # rotating its WAL or deleting compacted files.
+    CATCH_UP_ATTEMPTS = 5
+
+    def __init__(self, dir_path: str = "data", memtable_max_size: int = 3,
+                 config: Optional[StorageConfig] = None, read_only: bool = False):
         self.dir_path = dir_path
         self.memtable_max_size = memtable_max_size
-        os.makedirs(dir_path, exist_ok=True)
+        self.config = config or StorageConfig()
+        self.stats = EngineStats()
+        self.read_only = read_only
+        if read_only:
+            if not os.path.isdir(dir_path):
+                raise FileNotFoundError(f"No database directory at {dir_path}")
+        else:
+            os.makedirs(dir_path, exist_ok=True)
+        self._dir_lock = None if read_only else self._lock_dir()
+
+        # Guards every structure below that background threads touch.
+        # Condition is notified whenever the LSM shape changes.
+        self._lock = threading.RLock()
+        self._cond = threading.Condition(self._lock)
 
         # Active components
         self.memtable = SkipList()
         self.wal_path = os.path.join(dir_path, "recovery.wal")
-        self.wal = WALLogger(self.wal_path)
+        # Primaries open it in _recover_wals, once a torn tail is cut off
+        self.wal: Optional[WALLogger] = None
+
+        # Frozen MemTables waiting for flush (oldest -> newest), each with
+        # the rotated WAL that protects it until its SSTable exists.
+        self.immutable_memtables: List[Tuple[SkipList, str]] = []
 
         # 2. Immutable Components (SSTables)
-        # In a real reboot scenario, we would load existing .sst files here.
-        self.sst_readers: List[SSTableReader] = []
+        # levels[0] holds flushed files (oldest -> newest); deeper levels are older.
+        self.levels: List[List[SSTableReader]] = [[]]
+        self._next_file_number = self._max_file_number() + 1
+
+        # Large values live in blob files (by file number), referenced from SSTables
+        self.blob_files: Dict[int, BlobFileReader] = {}
+        self.blob_gc = BlobGarbageCollector(self.config.blob_gc_garbage_ratio)
+
+        # Secondaries: which WAL state the MemTable mirrors (see try_catch_up_with_primary)
+        self._tail_state: Optional[tuple] = None
+        self._wal_inode: Optional[int] = None
+        self._wal_offset = 0
+
+        # 3. Background I/O budget shared by flush and compaction
+        self.rate_limiter: Optional[RateLimiter] = None
+        if self.config.rate_limit_bytes_per_sec > 0:
+            self.rate_limiter = RateLimiter(
+                self.config.rate_limit_bytes_per_sec,
+                auto_tuned=self.config.rate_limit_auto_tuned,
+            )
+
+        # Hot point lookups (invalidated by every write to the key)
+        self.row_cache: Optional[RowCache] = None
+        if self.config.row_cache_size > 0:
+            self.row_cache = RowCache(self.config.row_cache_size)
+
+        # Bounded set of SSTables with an open fd / mapping (None: all stay open).
+        # Read-only instances keep every table open: the primary deletes
+        # compacted files they still list, and only an open handle keeps
+        # those readable until the next catch-up.
+        self.table_cache: Optional[TableCache] = None
+        if self.config.max_open_files > 0 and not read_only:
+            self.table_cache = TableCache(self.config.max_open_files)
+
+        # 4. Compaction (TTL expiry rides on the compaction filter hook)
+        compaction_filter = self.config.compaction_filter
+        if self.config.ttl_enabled:
+            compaction_filter = TtlCompactionFilter(inner=compaction_filter)
+        self.compactor = Compactor(
+            rate_limiter=self.rate_limiter,
+            compaction_filter=compaction_filter,
+            blob_resolver=self._read_blob,
+            read_mode=self.config.sstable_read_mode,
+            table_cache=self.table_cache,
+        )
+        self.compaction_strategy = create_compaction_strategy(self.config)
+
+        # 5. Backpressure: recomputed on every flush/compaction, read by put
+        self.write_controller = WriteController(self.config)
+        self._write_stopped = False
+        self._write_delay = 0.0
+
+        # 6. Background workers (flush preempts compaction via the rate limiter)
+        self._closing = False
+        self._background_error: Optional[BaseException] = None
+        self._compaction_running = False # The compaction thread is merging a job
+        self._workers: List[threading.Thread] = []
+
+        if read_only:
+            # A read-only view is whatever the primary has made durable
+            self.try_catch_up_with_primary()
+            return
+
+        # Reopen the file set recorded by the last run (or a checkpoint),
+        # then replay the WALs of writes that never reached an SSTable.
+        try:
+            self._load_manifest()
+            self._recover_wals()
+        except BaseException:
+            self.close() # Don't leak the LOCK (or opened tables) on a refused open
+            raise
 
-    def put(self, key: str, value: str) -> None:
+        if self.config.background_jobs:
+            for target, name in ((self._flush_worker, "flush"), (self._compaction_worker, "compaction")):
+                worker = threading.Thread(target=target, name=f"storage-{name}", daemon=True)
+                worker.start()
+                self._workers.append(worker)
+
+    @classmethod
+    def open_read_only(cls, dir_path: str, config: Optional[StorageConfig] = None) -> 'StorageEngine':
+        """
+        Opens a static, read-only view of a database that another process
+        may be writing to. It takes no lock and writes nothing; call
+        `try_catch_up_with_primary` to pick up the primary's newer writes.
+        """
+        return cls(dir_path, config=config, read_only=True)
+
+    @classmethod
+    def open_as_secondary(cls, dir_path: str, catch_up_interval: float = 1.0,
+                          config: Optional[StorageConfig] = None) -> 'StorageEngine':
+        """
+        Opens a read-only instance that tails the primary: a background
+        thread catches up with its flushes, compactions and WAL every
+        `catch_up_interval` seconds. Reads scale out over any number of
+        secondaries, at the cost of lagging the primary by up to one interval.
+        """
+        engine = cls.open_read_only(dir_path, config=config)
+        worker = threading.Thread(
+            target=engine._catch_up_worker, args=(catch_up_interval,),
+            name="storage-catch-up", daemon=True,
+        )
+        worker.start()
+        engine._workers.append(worker)
+        return engine
+
+    @property
+    def sst_readers(self) -> List[SSTableReader]:
+        """All live SSTables ordered oldest -> newest."""
+        readers = []
+        for level in reversed(self.levels):
+            readers.extend(level)
+        return readers
+
+    def put(self, key: str, value: str, ttl: Optional[float] = None) -> None:
         """
         Writes data. Flushes to disk if MemTable is full.
+
+        Args:
+            ttl: Seconds until the value expires (TTL-enabled engines only).
+                 Defaults to `config.default_ttl`.
         """
-        self.wal.append(key, value, fsync=True)
-        self.memtable.insert(key, value)
+        user_bytes = len(key.encode('utf-8')) + len(value.encode('utf-8'))
+        if self.config.ttl_enabled:
+            expires_at = ttl_codec.expiry_for(ttl if ttl is not None else self.config.default_ttl)
+            value = ttl_codec.encode(value, expires_at)
+        elif ttl is not None:
+            raise ValueError("ttl requires a StorageConfig with ttl_enabled=True")
 
-        # Check size threshold (simplification: using node count instead of bytes)
-        # In production, we would track estimated byte size.
-        if self._get_memtable_size() >= self.memtable_max_size:
+        self._check_writable()
+        self._delay_write()
+
+        with self._lock:
+            self.wal.append(key, value, fsync=True)
+            self.memtable.insert(key, value)
+            self.stats.user_bytes_written += user_bytes
+            if self.row_cache is not None:
+                self.row_cache.invalidate(key)
+
+            # Check size threshold (simplification: using node count instead of bytes)
+            # In production, we would track estimated byte size.
+            full = self._get_memtable_size() >= self.memtable_max_size
+            if full and self.config.background_jobs:
+                self._switch_memtable()
+                return
+
+        if full:
             self.flush()
 
     def get(self, key: str) -> Optional[str]:
-        """Read Path: MemTable -> SSTable (Newest -> Oldest)"""
+        """Read Path: Row Cache -> MemTable -> Immutable MemTables -> SSTable (Newest -> Oldest)"""
+        with self._lock:
+            found, entry = False, None
+            if self.row_cache is not None:
+                found, entry = self.row_cache.get(key)
+            if not found:
+                entry = self._read_entry(key)
+                if self.row_cache is not None:
+                    self.row_cache.put(key, entry, len(entry[1]) if entry else 0)
+
+        if entry is None:
+            return None
+        # The newest version decides: an expired value hides older ones too
+        expires_at, val = entry
+        if ttl_codec.is_expired(expires_at):
+            return None
+        return val
+
+    def _read_entry(self, key: str) -> Optional[Tuple[int, str]]:
+        """Newest version of key decoded as (expires_at, value), or None."""
+        val = self._lookup(key)
+        if val is None:
+            return None
+        if self.config.ttl_enabled:
+            return ttl_codec.decode(val)
+        return ttl_codec.NO_EXPIRY, val
+
+    def _lookup(self, key: str) -> Optional[str]:
+        """Returns the newest stored value for key, as written to disk."""
+        with self._lock:
+            val = self._newest_stored(key)
+            if isinstance(val, BlobPointer):
+                # Resolved under the lock: GC cannot unmap the file meanwhile
+                return self._read_blob(val)
+            return val
+
+    def _newest_stored(self, key: str) -> Optional[Union[str, BlobPointer]]:
+        """Newest version of key, blob-separated values as their pointer (caller holds the lock)."""
         # 1. Check Volatile Memory
         val = self.memtable.search(key)
         if val is not None:
             return val
 
+        for memtable, _ in reversed(self.immutable_memtables):
+            val = memtable.search(key)
+            if val is not None:
+                return val
+
         # 2. Check Disk (Immutable SSTable)
         # Iterate in reverse to find the most recent version of the key
         for reader in reversed(self.sst_readers):
@@ -53,34 +280,614 @@ class StorageEngine:
             if val is not None:
                 return val
 
-            return None
+        return None
+
+    def _read_blob(self, pointer: BlobPointer) -> str:
+        return self.blob_files[pointer.file_number].read(pointer)
 
     def flush(self) -> None:
         """freezes MemTable -> writes to SSTable -> clears MemTable"""
+        self._check_writable()
+        with self._lock:
+            self._switch_memtable()
+
+            if self.config.background_jobs:
+                # The flush thread does the work; wait for it to drain the queue.
+                while self.immutable_memtables and self._background_error is None:
+                    self._cond.wait()
+                self._raise_background_error()
+                return
+
+        while self.immutable_memtables:
+            self._flush_memtable(*self.immutable_memtables[0])
+
+        # Keep the number of sorted runs in check
+        self.compact()
+
+    def _switch_memtable(self) -> None:
+        """Freezes the active MemTable and rotates the WAL (caller holds the lock)."""
         if self._get_memtable_size() == 0:
             return
 
-        # 1. Generate filename (timestamp based)
-        timestamp = int(time.time() * 1000)
-        filename = f"{timestamp}.sst"
-        filepath = os.path.join(self.dir_path, filename)
+        # The frozen MemTable keeps its log under a numbered name until it is flushed
+        self.wal.close()
+        frozen_wal = self._new_file_path(".wal")
+        os.replace(self.wal_path, frozen_wal)
+        self.wal = WALLogger(self.wal_path)
 
-        # 2. Write to disk
-        writer = SSTableWriter()
-        writer.write(self.memtable, filepath)
+        self.immutable_memtables.append((self.memtable, frozen_wal))
+        self.memtable = SkipList()
+        self._on_version_change()
 
-        # 3. Open a reader for the new file and add to list
-        reader = SSTableReader(filepath)
-        self.sst_readers.append(reader)
+    def _flush_memtable(self, memtable: SkipList, wal_path: str) -> None:
+        """Writes a frozen MemTable to a new L0 SSTable and drops its WAL."""
+        # 1. Generate filenames (monotonic file numbers)
+        with self._lock:
+            filepath = self._new_file_path(".sst")
+            blob_writer = None
+            if self.config.enable_blob_files:
+                blob_number = self._new_file_number()
+                blob_writer = BlobFileWriter(self._file_path(blob_number, ".blob"), blob_number)
 
-        # 4. Clear MemTable and WAL
-        # (In production, we would truncate the WAL here)
-        self.memtable = SkipList()
-        # Re-open WAL to clear it
-        self.wal.close()
-        open(self.wal_path, 'w').close()
+        # 2. Write to disk (MemTable is frozen, no lock needed)
+        writer = SSTableWriter(
+            rate_limiter=self.rate_limiter,
+            blob_writer=blob_writer,
+            min_blob_size=self.config.min_blob_size,
+        )
+        writer.write(memtable, filepath)
+        reader = self._open_sstable(filepath)
+
+        blob_reader = None
+        if blob_writer is not None:
+            blob_writer.close()
+            if blob_writer.offset > 0:
+                blob_reader = BlobFileReader(blob_writer.filepath, blob_writer.file_number)
+            else:
+                os.remove(blob_writer.filepath) # No value was large enough
+
+        # 3. Publish the new file in L0 and retire the MemTable and its WAL
+        with self._lock:
+            if blob_reader is not None:
+                self.blob_files[blob_reader.file_number] = blob_reader
+                self.stats.flush_bytes_written += blob_reader.file_size
+            self.levels[0].append(reader)
+            self.immutable_memtables = [
+                entry for entry in self.immutable_memtables if entry[0] is not memtable
+            ]
+            self.stats.flush_bytes_written += reader.file_size
+            # The SSTable must be in the MANIFEST before its WAL disappears
+            self._save_manifest()
+            os.remove(wal_path)
+            self._on_version_change()
+
+    def compact(self) -> None:
+        """Runs compaction jobs until the strategy has nothing left to do."""
+        self._check_writable()
+        if self.config.background_jobs:
+            # The compaction thread owns every job (two merges of the same
+            # inputs would both try to install); wait for it to run dry.
+            with self._lock:
+                while (self._compaction_running or self.compaction_strategy.pick(self.levels) is not None) \
+                        and self._background_error is None and not self._closing:
+                    self._cond.wait()
+                self._raise_background_error()
+            return
+
+        while True:
+            with self._lock:
+                job = self.compaction_strategy.pick(self.levels)
+            if job is None:
+                return
+            self._run_compaction(job)
+
+    def _run_compaction(self, job: CompactionJob) -> None:
+        """Merges the job's inputs and swaps them for the output in the level structure."""
+        with self._lock:
+            output_path = self._new_file_path(".sst")
+            # Filters may only drop keys when nothing older exists outside the job
+            oldest = self.sst_readers[:len(job.inputs)]
+            bottommost = all(any(r is t for t in job.inputs) for r in oldest)
+
+        # Inputs are immutable and only this job may delete them: merge unlocked.
+        changed_keys = self.compactor.merge([r.filepath for r in job.inputs], output_path, bottommost=bottommost)
+
+        # A filter may have dropped every key; mmap cannot map an empty file.
+        output = None
+        if os.path.getsize(output_path) > 0:
+            output = self._open_sstable(output_path)
+        else:
+            os.remove(output_path)
+
+        with self._lock:
+            self._install_compaction(job, output)
+            # Plain merges never change what a read returns; filters can
+            if self.row_cache is not None:
+                for key in changed_keys:
+                    self.row_cache.invalidate(key)
+
+    def _install_compaction(self, job: CompactionJob, output: Optional[SSTableReader]) -> None:
+        """Swaps a finished job's inputs for its output (caller holds the lock)."""
+        self.stats.compactions += 1
+        if output is not None:
+            self.stats.compaction_bytes_written += output.file_size
+
+        while len(self.levels) <= job.output_level:
+            self.levels.append([])
+
+        # The output takes the place of its inputs so the age order of the
+        # remaining runs in the target level is preserved.
+        target = self.levels[job.output_level]
+        insert_at = min((target.index(r) for r in job.inputs if r in target), default=0)
+        for level in self.levels:
+            level[:] = [r for r in level if r not in job.inputs]
+        if output is not None:
+            target.insert(insert_at, output)
+
+        # Inputs may only be deleted once the MANIFEST no longer lists them
+        self._save_manifest()
+        for reader in job.inputs:
+            reader.close()
+            if self.table_cache is not None:
+                self.table_cache.evict(reader.filepath)
+            os.remove(reader.filepath)
+
+        self._on_version_change()
+
+    def collect_blob_garbage(self) -> None:
+        """
+        Reclaims blob file space (WiscKey-style).
+
+        1. Blob files no SSTable points to anymore are deleted.
+        2. Live values in files that are mostly garbage are written again
+           (through the WAL and MemTable, so the next flush moves them to a
+           fresh blob file). The old file is deleted by a later pass, once
+           compaction has dropped the superseded pointers.
+
+        The liveness scan reads every SSTable, so it runs without the engine
+        lock over a snapshot of the file set. Each relocation is re-checked
+        under the lock before it is written.
+        """
+        self._check_writable()
+        with self._lock:
+            shadowed = {key for key, _ in self.memtable}
+            for memtable, _ in self.immutable_memtables:
+                shadowed.update(key for key, _ in memtable)
+            paths = [r.filepath for r in reversed(self.sst_readers)]
+            blobs = dict(self.blob_files)
+
+        is_expired = None
+        if self.config.ttl_enabled:
+            def is_expired(pointer: BlobPointer) -> bool:
+                return ttl_codec.is_expired(ttl_codec.decode(blobs[pointer.file_number].read(pointer))[0])
+
+        # Blob files created after the snapshot are not candidates, and
+        # compaction only ever drops pointers, so the verdicts stay valid.
+        try:
+            dead, relocations = self.blob_gc.collect(
+                self._scan_tables(paths),
+                shadowed,
+                {number: blob.file_size for number, blob in blobs.items()},
+                is_expired,
+            )
+        except FileNotFoundError:
+            return # A table was compacted away mid-scan; the next pass starts over
+
+        relocated = False
+        with self._lock:
+            dead_blobs = [self.blob_files.pop(number) for number in dead if number in self.blob_files]
+            if dead_blobs:
+                self._save_manifest()
+            for blob in dead_blobs:
+                blob.close()
+                os.remove(blob.filepath)
+                self.stats.blob_files_deleted += 1
+
+            for number, entries in relocations.items():
+                for key, pointer in entries:
+                    # A put (or a compaction filter) may have replaced it since the scan
+                    if self._newest_stored(key) != pointer:
+                        continue
+                    value = self._read_blob(pointer)
+                    self.wal.append(key, value, fsync=False)
+                    self.memtable.insert(key, value)
+                    self.stats.blob_bytes_relocated += pointer.length
+                    relocated = True
+            if relocated:
+                self.wal.flush()
+
+        if relocated:
+            self.flush()
+
+    def _scan_tables(self, paths: List[str]):
+        """
+        Readers for an unlocked scan. They are separate from the live readers
+        (which compaction may close meanwhile) but share their cached handles.
+        """
+        for path in paths:
+            reader = self._open_sstable(path)
+            try:
+                yield reader
+            finally:
+                reader.close()
+
+    def checkpoint(self, dest_dir: str) -> None:
+        """
+        Creates a consistent, openable copy of the database in `dest_dir`
+        (which must not exist yet).
+
+        The MemTable is flushed first, so the checkpoint needs no WAL. Every
+        live SSTable and blob file is immutable, so it is hard-linked rather
+        than copied: a checkpoint costs a few metadata operations and no
+        extra disk space until the live database compacts the files away.
+        Open it with `StorageEngine(dest_dir)`.
+        """
+        self._check_writable()
+        os.makedirs(dest_dir)
+        self.flush()
+
+        # Holding the lock pins the file set: compaction and blob GC need it
+        # to delete anything, and once linked a file survives their deletes.
+        with self._lock:
+            files = [r.filepath for r in self.sst_readers]
+            files += [blob.filepath for blob in self.blob_files.values()]
+            for path in files:
+                target = os.path.join(dest_dir, os.path.basename(path))
+                try:
+                    os.link(path, target)
+                except OSError:
+                    # e.g. EXDEV: destination on another filesystem
+                    shutil.copy2(path, target)
+            self._manifest().save(dest_dir)
+
+    def _manifest(self) -> Manifest:
+        """Describes the current file set (caller holds the lock)."""
+        return Manifest(
+            levels=[[os.path.basename(r.filepath) for r in level] for level in self.levels],
+            blob_files=[os.path.basename(b.filepath) for b in self.blob_files.values()],
+            next_file_number=self._next_file_number,
+            ttl_enabled=self.config.ttl_enabled,
+        )
+
+    def _save_manifest(self) -> None:
+        self._manifest().save(self.dir_path)
+
+    def _load_manifest(self) -> None:
+        manifest = Manifest.load(self.dir_path)
+        if manifest is None:
+            # Record the value format before the first write reaches the WAL
+            self._save_manifest()
+            return
+
+        self._check_value_format(manifest)
+        self.levels, self.blob_files, _ = self._open_file_set(manifest)
+        self._next_file_number = max(self._next_file_number, manifest.next_file_number)
+
+    def _check_value_format(self, manifest: Manifest) -> None:
+        """TTL-encoded and plain values can't be told apart: refuse a mismatched open."""
+        if manifest.ttl_enabled != self.config.ttl_enabled:
+            raise ValueError(
+                f"{self.dir_path} was created with ttl_enabled={manifest.ttl_enabled}; "
+                f"open it with the same setting"
+            )
+
+    def _open_file_set(self, manifest: Manifest):
+        """
+        Opens readers for the files a MANIFEST lists, reusing the ones this
+        instance already has open.
+
+        Returns:
+            (levels, blob_files, newly_opened_readers)
+        """
+        ssts = {os.path.basename(r.filepath): r for r in self.sst_readers}
+        blobs = {os.path.basename(b.filepath): b for b in self.blob_files.values()}
+        opened = []
+        try:
+            levels = []
+            for names in manifest.levels:
+                level = []
+                for name in names:
+                    reader = ssts.get(name)
+                    if reader is None:
+                        reader = self._open_sstable(os.path.join(self.dir_path, name))
+                        opened.append(reader)
+                    level.append(reader)
+                levels.append(level)
+
+            blob_files = {}
+            for name in manifest.blob_files:
+                blob = blobs.get(name)
+                if blob is None:
+                    number = int(os.path.splitext(name)[0])
+                    blob = BlobFileReader(os.path.join(self.dir_path, name), number)
+                    opened.append(blob)
+                blob_files[blob.file_number] = blob
+        except BaseException:
+            for reader in opened:
+                reader.close()
+            raise
+        return levels or [[]], blob_files, opened
+
+    def _open_sstable(self, filepath: str) -> SSTableReader:
+        return SSTableReader(filepath, read_mode=self.config.sstable_read_mode, table_cache=self.table_cache)
+
+    def _frozen_wal_paths(self) -> List[str]:
+        """Rotated WALs of MemTables that were never flushed, oldest first."""
+        paths = glob.glob(os.path.join(self.dir_path, "*.wal"))
+        numbered = [p for p in paths if os.path.splitext(os.path.basename(p))[0].isdigit()]
+        return sorted(numbered, key=lambda p: int(os.path.splitext(os.path.basename(p))[0]))
+
+    def _recover_wals(self) -> None:
+        """
+        Replays writes that never reached an SSTable (primary startup).
+        Frozen WALs go back on the flush queue with their MemTables; the
+        active WAL refills the MemTable and is then reopened for appends.
+
+        A crash can leave a half-written record at the end of a log. It is
+        cut off before appending: records written after it would otherwise
+        be unreachable for every later replay (and for secondaries).
+        """
+        for wal_path in self._frozen_wal_paths():
+            memtable = SkipList()
+            reader = WALReader(wal_path)
+            for key, value in reader:
+                memtable.insert(key, value)
+            self._truncate_torn_tail(reader)
+            self.immutable_memtables.append((memtable, wal_path))
+
+        if os.path.exists(self.wal_path):
+            reader = WALReader(self.wal_path)
+            for key, value in reader:
+                self.memtable.insert(key, value)
+            self._truncate_torn_tail(reader)
         self.wal = WALLogger(self.wal_path)
 
+    @staticmethod
+    def _truncate_torn_tail(reader: WALReader) -> None:
+        """Drops bytes after the last complete record a WALReader replayed."""
+        if os.path.getsize(reader.path) > reader.offset:
+            os.truncate(reader.path, reader.offset)
+
+    def try_catch_up_with_primary(self) -> bool:
+        """
+        Brings a read-only instance up to date with the primary: opens the
+        SSTables and blob files its MANIFEST now lists, drops the ones
+        compaction removed and rebuilds the MemTable from its WALs.
+
+        When neither the MANIFEST nor the set of WAL files changed, only the
+        records appended to the active WAL since the last call are read.
+
+        Returns:
+            True if the visible data may have changed.
+        """
+        if not self.read_only:
+            raise RuntimeError("Only read-only instances catch up with a primary")
+
+        for _ in range(self.CATCH_UP_ATTEMPTS):
+            wal_inode = self._inode(self.wal_path)
+            frozen_wals = self._frozen_wal_paths()
+            manifest = Manifest.load(self.dir_path)
+            if manifest is None:
+                manifest = Manifest([[]], [], 0, ttl_enabled=self.config.ttl_enabled)
+            self._check_value_format(manifest)
+            state = (manifest.levels, manifest.blob_files, frozen_wals, wal_inode)
+
+            if state == self._tail_state:
+                # Fast path: just tail the active WAL
+                if wal_inode is None:
+                    return False
+                reader = WALReader(self.wal_path, self._wal_offset, expected_inode=wal_inode)
+                try:
+                    records = list(reader)
+                except FileNotFoundError:
+                    continue
+                if reader.inode != wal_inode:
+                    continue # Rotated since the stat: rebuild
+                with self._lock:
+                    for key, value in records:
+                        self.memtable.insert(key, value)
+                        if self.row_cache is not None:
+                            self.row_cache.invalidate(key)
+                    self._wal_offset = reader.offset
+                return bool(records)
+
+            # Slow path: replay every WAL into a fresh MemTable and reopen the
+            # file set. The active WAL was stat'ed before listing the frozen
+            # ones, so a rotation in between is either listed or detected by
+            # the inode check; a frozen WAL flushed meanwhile is either read
+            # or missing (retry), never lost.
+            try:
+                memtable = SkipList()
+                for wal_path in frozen_wals:
+                    for key, value in WALReader(wal_path):
+                        memtable.insert(key, value)
+                reader = WALReader(self.wal_path, expected_inode=wal_inode)
+                if wal_inode is not None:
+                    for key, value in reader:
+                        memtable.insert(key, value)
+            except FileNotFoundError:
+                continue # A frozen WAL was flushed and deleted meanwhile
+
+            if wal_inode is not None and reader.inode != wal_inode:
+                continue
+            try:
+                levels, blob_files, opened = self._open_file_set(manifest)
+            except FileNotFoundError:
+                continue # Compacted away after we read the MANIFEST
+            if self._inode(self.wal_path) != wal_inode:
+                # The primary switched MemTables: what we replayed may be
+                # neither in the WAL we read nor in the MANIFEST we loaded.
+                for opened_reader in opened:
+                    opened_reader.close()
+                continue
+
+            with self._lock:
+                old_files = self.sst_readers + list(self.blob_files.values())
+                self.levels, self.blob_files, self.memtable = levels, blob_files, memtable
+                live = set(map(id, self.sst_readers)) | set(map(id, self.blob_files.values()))
+                for old in old_files:
+                    if id(old) not in live:
+                        old.close()
+                self._tail_state = state
+                self._wal_offset = reader.offset
+                if self.row_cache is not None:
+                    self.row_cache.clear()
+            return True
+
+        return False
+
+    def _catch_up_worker(self, interval: float) -> None:
+        """Background thread of a secondary: periodically catches up with the primary."""
+        while True:
+            with self._lock:
+                if not self._closing:
+                    self._cond.wait(timeout=interval)
+                if self._closing:
+                    return
+            if not self._run_background(self.try_catch_up_with_primary):
+                return
+
+    @staticmethod
+    def _inode(path: str) -> Optional[int]:
+        try:
+            return os.stat(path).st_ino
+        except FileNotFoundError:
+            return None
+
+    def _check_writable(self) -> None:
+        if self.read_only:
+            raise RuntimeError(f"{self.dir_path} is opened read-only")
+
+    def _lock_dir(self):
+        """Makes sure only one primary writes to the directory at a time."""
+        lock_file = open(os.path.join(self.dir_path, self.LOCK_NAME), "a")
+        if fcntl is not None:
+            try:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                lock_file.close()
+                raise RuntimeError(f"{self.dir_path} is already opened by another primary")
+        return lock_file
+
+    def _on_version_change(self) -> None:
+        """
+        Re-evaluates compaction debt and write stalls after the LSM shape
+        changed, then wakes background workers and stalled writers
+        (caller holds the lock).
+        """
+        pending = self.compaction_strategy.estimate_pending_bytes(self.levels)
+        if self.rate_limiter is not None:
+            self.rate_limiter.update_compaction_debt(pending)
+
+        self._write_stopped, self._write_delay = self.write_controller.evaluate(
+            l0_files=len(self.levels[0]),
+            immutable_memtables=len(self.immutable_memtables),
+            pending_compaction_bytes=pending,
+        )
+        if self._write_stopped and not self.immutable_memtables \
+                and self.compaction_strategy.pick(self.levels) is None:
+            # No flush or compaction is coming that could lift the stop, so
+            # blocking would wait forever: keep writes slowed down instead.
+            self._write_stopped = False
+        self._cond.notify_all()
+
+    def _delay_write(self) -> None:
+        """
+        Applies backpressure before a write. Writes are slowed down gradually
+        between the slowdown and stop thresholds and block at the stop
+        threshold until background work catches up. Without background jobs
+        `put` already pays for flush and compaction inline, so there is
+        nothing to wait for.
+        """
+        if not self.config.background_jobs:
+            return
+
+        started = time.monotonic()
+        with self._lock:
+            self._raise_background_error()
+            stalled = self._write_stopped or self._write_delay > 0
+            while self._write_stopped and not self._closing and self._background_error is None:
+                self._cond.wait()
+            self._raise_background_error()
+            delay = self._write_delay
+
+        if delay > 0:
+            time.sleep(delay)
+
+        if stalled:
+            with self._lock:
+                self.stats.write_stalls += 1
+                self.stats.write_stall_seconds += time.monotonic() - started
+
+    def _flush_worker(self) -> None:
+        """Background thread: flushes frozen MemTables in order."""
+        while True:
+            with self._lock:
+                while not self.immutable_memtables and not self._closing:
+                    self._cond.wait()
+                # On close, keep going until every frozen MemTable is on disk
+                if not self.immutable_memtables:
+                    return
+                memtable, wal_path = self.immutable_memtables[0]
+            if not self._run_background(self._flush_memtable, memtable, wal_path):
+                return
+
+    def _compaction_worker(self) -> None:
+        """Background thread: runs one compaction job at a time."""
+        while True:
+            with self._lock:
+                job = None
+                while not self._closing:
+                    job = self.compaction_strategy.pick(self.levels)
+                    if job is not None:
+                        break
+                    self._cond.wait()
+                if job is None:
+                    return
+                self._compaction_running = True
+            succeeded = self._run_background(self._run_compaction, job)
+            with self._lock:
+                self._compaction_running = False
+                self._cond.notify_all()
+            if not succeeded:
+                return
+
+    def _run_background(self, func, *args) -> bool:
+        """Runs a background job, parking the error for foreground callers on failure."""
+        try:
+            func(*args)
+            return True
+        except Exception as e:
+            with self._lock:
+                self._background_error = e
+                self._cond.notify_all()
+            return False
+
+    def _raise_background_error(self) -> None:
+        if self._background_error is not None:
+            raise RuntimeError("Background flush/compaction failed") from self._background_error
+
+    def _new_file_number(self) -> int:
+        number = self._next_file_number
+        self._next_file_number += 1
+        return number
+
+    def _file_path(self, number: int, extension: str) -> str:
+        return os.path.join(self.dir_path, f"{number:06d}{extension}")
+
+    def _new_file_path(self, extension: str) -> str:
+        return self._file_path(self._new_file_number(), extension)
+
+    def _max_file_number(self) -> int:
+        """Highest numbered file in the directory, so new files never clobber old ones."""
+        numbers = [0]
+        for pattern in ("*.sst", "*.wal", "*.blob"):
+            for path in glob.glob(os.path.join(self.dir_path, pattern)):
+                stem = os.path.splitext(os.path.basename(path))[0]
+                if stem.isdigit():
+                    numbers.append(int(stem))
+        return max(numbers)
+
     def _get_memtable_size(self):
         """Helper to count nodes in SkipList (O(N) for now, usually 0(1) with counter)."""
         count = 0
@@ -90,6 +897,20 @@ class StorageEngine:
 
     def close(self):
         """Cleanly closes resources."""
-        self.wal.close()
+        # Background workers finish in-flight work (and pending flushes) first
+        with self._lock:
+            self._closing = True
+            self._cond.notify_all()
+        for worker in self._workers:
+            worker.join()
+
+        if self.wal is not None:
+            self.wal.close()
         for reader in self.sst_readers:
             reader.close()
+        for blob in self.blob_files.values():
+            blob.close()
+        if self.table_cache is not None:
+            self.table_cache.clear()
+        if self._dir_lock is not None:
+            self._dir_lock.close() # Releases the flock
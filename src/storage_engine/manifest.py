@@ -0,0 +1,53 @@
+import json
+import os
+from typing import List, Optional
+
+
+MANIFEST_NAME = "MANIFEST"
+
+
+class Manifest:
+    """
+    Describes the live file set of a data directory: which SSTables belong to
+    which level (oldest -> newest within a level, as in StorageEngine.levels)
+    and which blob files are live. File names are relative to the directory,
+    so a directory of hard links plus its MANIFEST is a complete copy.
+
+    It also records the value format: with `ttl_enabled` every stored value
+    carries an expiry prefix, so the directory must always be opened that way.
+    """
+    __slots__ = ('levels', 'blob_files', 'next_file_number', 'ttl_enabled')
+
+    def __init__(self, levels: List[List[str]], blob_files: List[str], next_file_number: int,
+                 ttl_enabled: bool = False):
+        self.levels = levels
+        self.blob_files = blob_files
+        self.next_file_number = next_file_number
+        self.ttl_enabled = ttl_enabled
+
+    def save(self, dir_path: str) -> None:
+        """Atomically replaces the directory's MANIFEST (write temp, fsync, rename)."""
+        path = os.path.join(dir_path, MANIFEST_NAME)
+        tmp_path = path + ".tmp"
+        data = {
+            "levels": self.levels,
+            "blob_files": self.blob_files,
+            "next_file_number": self.next_file_number,
+            "ttl_enabled": self.ttl_enabled,
+        }
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, dir_path: str) -> Optional['Manifest']:
+        """Returns None for directories that were never written by a manifest-aware engine."""
+        path = os.path.join(dir_path, MANIFEST_NAME)
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            data = json.load(f)
+        return cls(data["levels"], data["blob_files"], data["next_file_number"],
+                   data.get("ttl_enabled", False))
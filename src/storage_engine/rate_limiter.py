@@ -0,0 +1,118 @@
+import threading
+import time
+
+
+# I/O priorities. Flushes free MemTable space for foreground writes, so they
+# must never queue behind a large compaction.
+IO_PRIORITY_LOW = 0   # Compaction
+IO_PRIORITY_HIGH = 1  # Flush
+
+
+class RateLimiter:
+    """
+    Token bucket shared by every background writer (flush and compaction).
+
+    Tokens are bytes. The bucket refills continuously at `rate_bytes_per_sec`
+    and holds at most `refill_period` seconds worth of tokens, so a writer
+    that was idle cannot burst far above the configured rate.
+
+    While a high-priority request is waiting, low-priority requests are held
+    back even if tokens are available, which lets a flush preempt compaction.
+
+    In auto-tuned mode `rate_bytes_per_sec` is the ceiling: the limiter starts
+    at half of it and moves between `ceiling / 20` and the ceiling depending
+    on whether compaction debt is growing or shrinking.
+    """
+
+    AUTO_TUNE_STEP = 1.25
+
+    def __init__(self, rate_bytes_per_sec: int, refill_period: float = 0.1, auto_tuned: bool = False):
+        if rate_bytes_per_sec <= 0:
+            raise ValueError("rate_bytes_per_sec must be positive")
+        self.max_rate = rate_bytes_per_sec
+        self.min_rate = max(1, rate_bytes_per_sec // 20)
+        self.refill_period = refill_period
+        self.auto_tuned = auto_tuned
+        self.rate = rate_bytes_per_sec // 2 if auto_tuned else rate_bytes_per_sec
+        self.rate = max(self.rate, self.min_rate)
+
+        self._cond = threading.Condition()
+        self._tokens = float(self._burst())
+        self._last_refill = time.monotonic()
+        self._high_waiters = 0
+        self._last_debt = 0
+
+        # Stats
+        self.bytes_through = {IO_PRIORITY_LOW: 0, IO_PRIORITY_HIGH: 0}
+        self.wait_seconds = 0.0
+
+    def _burst(self) -> int:
+        return max(1, int(self.rate * self.refill_period))
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        self._tokens = min(self._burst(), self._tokens + elapsed * self.rate)
+
+    def request(self, num_bytes: int, priority: int = IO_PRIORITY_LOW) -> None:
+        """Blocks until `num_bytes` may be written at the given priority."""
+        remaining = num_bytes
+        while remaining > 0:
+            # Never ask for more than the bucket can hold, or we would wait forever.
+            chunk = min(remaining, self._burst())
+            self._acquire(chunk, priority)
+            remaining -= chunk
+
+    def _acquire(self, num_bytes: int, priority: int) -> None:
+        started = time.monotonic()
+        with self._cond:
+            is_high = priority == IO_PRIORITY_HIGH
+            if is_high:
+                self._high_waiters += 1
+            try:
+                while True:
+                    self._refill()
+                    blocked_by_high = not is_high and self._high_waiters > 0
+                    # The rate may have been lowered since the request was
+                    # chunked; a full bucket is always enough (tokens go negative).
+                    needed = min(num_bytes, self._burst())
+                    if not blocked_by_high and self._tokens >= needed:
+                        self._tokens -= num_bytes
+                        break
+                    if blocked_by_high:
+                        # Only a finishing high-priority waiter can unblock us,
+                        # and it notifies on the way out: no need to poll.
+                        self._cond.wait()
+                        continue
+                    # Sleep until the deficit is refilled (or a waiter wakes us).
+                    self._cond.wait(timeout=(needed - self._tokens) / self.rate)
+            finally:
+                if is_high:
+                    self._high_waiters -= 1
+                    self._cond.notify_all()
+
+            self.bytes_through[priority] += num_bytes
+            self.wait_seconds += time.monotonic() - started
+
+    def set_rate(self, rate_bytes_per_sec: int) -> None:
+        with self._cond:
+            self._refill()
+            self.rate = max(self.min_rate, min(self.max_rate, int(rate_bytes_per_sec)))
+            self._tokens = min(self._tokens, self._burst())
+            self._cond.notify_all()
+
+    def update_compaction_debt(self, pending_bytes: int) -> None:
+        """
+        Auto-tuning hook, called whenever the engine re-estimates how many bytes
+        compaction still has to rewrite. A growing backlog means compaction is
+        falling behind, so it is given more bandwidth; a shrinking one hands
+        bandwidth back to foreground I/O.
+        """
+        if not self.auto_tuned:
+            return
+        if pending_bytes > self._last_debt:
+            self.set_rate(self.rate * self.AUTO_TUNE_STEP)
+        elif pending_bytes < self._last_debt:
+            self.set_rate(self.rate / self.AUTO_TUNE_STEP)
+        self._last_debt = pending_bytes
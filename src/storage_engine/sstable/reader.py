@@ -1,87 +1,235 @@
 import mmap
 import os
 import struct
-from typing import Optional, Generator, Tuple
+from bisect import bisect_right
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Optional, Generator, Tuple, Union
+from src.storage_engine.blob.pointer import BlobPointer, BLOB_FLAG
+from src.storage_engine.cache.table_cache import TableCache
+from src.storage_engine.config import READ_MODE_MMAP, READ_MODE_PREAD
 
 
-class SSTableReader:
-    """Reads SSTable using Memory-Mapped I/O for zero-copy access."""
+# Access patterns, turned into madvise / posix_fadvise hints.
+ACCESS_RANDOM = "random"         # point lookups: no readahead
+ACCESS_SEQUENTIAL = "sequential" # scans and compaction: aggressive readahead
+
+_MADVISE = {
+    ACCESS_RANDOM: ("MADV_RANDOM",),
+    ACCESS_SEQUENTIAL: ("MADV_SEQUENTIAL", "MADV_WILLNEED"),
+}
+_FADVISE = {
+    ACCESS_RANDOM: ("POSIX_FADV_RANDOM",),
+    ACCESS_SEQUENTIAL: ("POSIX_FADV_SEQUENTIAL", "POSIX_FADV_WILLNEED"),
+}
+
+
+class _MmapHandle:
+    """An open table mapped into memory. Reads are slices of the mapping."""
+
     def __init__(self, filepath: str):
-        self.filepath = filepath
-        self.file = open(filepath, "rb")
-        # Map the entire file into memory
+        self.fd = os.open(filepath, os.O_RDONLY)
         # access=mmap.ACCESS_READ ensures we don't accidentally modify immutable data
-        self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.mm = mmap.mmap(self.fd, 0, access=mmap.ACCESS_READ)
+        self._access = None
+
+    def advise(self, access: str) -> None:
+        # The hint covers the whole mapping, so only re-issue it on a change
+        if access == self._access or not hasattr(self.mm, 'madvise'):
+            return
+        self._access = access
+        for name in _MADVISE[access]:
+            flag = getattr(mmap, name, None)
+            if flag is not None:
+                self.mm.madvise(flag)
+
+    def reader(self, access: str) -> Callable[[int, int], bytes]:
+        mm = self.mm
+        return lambda offset, size: mm[offset : offset + size]
+
+    def close(self) -> None:
+        self.mm.close()
+        os.close(self.fd)
+
+
+class _PreadHandle:
+    """
+    An open table read with os.pread, one block at a time. Needs no address
+    space; each scan keeps its own block buffer, so scans never share state.
+    """
+
+    # Bytes fetched per pread: small for point lookups, large for scans
+    BLOCK_SIZE = {ACCESS_RANDOM: 4 * 1024, ACCESS_SEQUENTIAL: 256 * 1024}
+
+    def __init__(self, filepath: str):
+        self.fd = os.open(filepath, os.O_RDONLY)
+        self._access = None
+
+    def advise(self, access: str) -> None:
+        if access == self._access or not hasattr(os, 'posix_fadvise'):
+            return
+        self._access = access
+        for name in _FADVISE[access]:
+            flag = getattr(os, name, None)
+            if flag is not None:
+                os.posix_fadvise(self.fd, 0, 0, flag)
+
+    def reader(self, access: str) -> Callable[[int, int], bytes]:
+        fd, block_size = self.fd, self.BLOCK_SIZE[access]
+        block, block_start = b"", 0
+
+        def read(offset: int, size: int) -> bytes:
+            nonlocal block, block_start
+            start = offset - block_start
+            if start < 0 or start + size > len(block):
+                block, block_start, start = os.pread(fd, max(size, block_size), offset), offset, 0
+            return block[start : start + size]
+
+        return read
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+_HANDLES = {READ_MODE_MMAP: _MmapHandle, READ_MODE_PREAD: _PreadHandle}
+
+
+class SSTableReader:
+    """
+    Reads SSTable using Memory-Mapped I/O for zero-copy access (or os.pread).
+    Values stored in blob files come back as BlobPointer instances.
+
+    Without a TableCache the file stays open for the reader's lifetime.
+    With one, the reader is just metadata (path, size, sparse index) and
+    borrows an open handle from the cache for each lookup or scan; readers
+    of the same file share that handle.
+    """
+
+    # A sparse index entry is kept for the first record of every block of
+    # this many bytes, so a point lookup scans at most about one block.
+    INDEX_INTERVAL = 4 * 1024
+
+    def __init__(self, filepath: str, read_mode: str = READ_MODE_MMAP,
+                 table_cache: Optional[TableCache] = None):
+        if read_mode not in _HANDLES:
+            raise ValueError(f"Unknown SSTable read mode: {read_mode!r}")
+        self.filepath = filepath
+        self.read_mode = read_mode
+        self.table_cache = table_cache
         self.file_size = os.path.getsize(filepath)
+        self._index_keys: Optional[List[bytes]] = None
+        self._index_offsets: List[int] = []
+        self._handle = None if table_cache is not None else self._open()
+
+    def _open(self):
+        return _HANDLES[self.read_mode](self.filepath)
 
-    def __iter__(self) -> Generator[Tuple[str, str], None, None]:
+    @contextmanager
+    def _pinned(self, access: str) -> Iterator[Callable[[int, int], bytes]]:
+        """Yields a read(offset, size) function for an open handle hinted for `access`."""
+        if self.table_cache is None:
+            handle = self._handle
+        else:
+            handle = self.table_cache.acquire(self.filepath, self._open)
+        try:
+            handle.advise(access)
+            yield handle.reader(access)
+        finally:
+            if self.table_cache is not None:
+                self.table_cache.release(handle)
+
+    def __iter__(self) -> Generator[Tuple[str, Union[str, BlobPointer]], None, None]:
         """
         Yields (key, value) pairs from the beginning of the file.
         Essential for Compaction.
         """
-        offset = 0
-        while offset < self.file_size:
-            # 1. Read Key Length
-            key_len_bytes = self.mm[offset : offset + 4]
-            if not key_len_bytes: break
-            key_len = struct.unpack('>I', key_len_bytes)[0]
-            offset += 4
-
-            # 2. Read Key
-            key_bytes = self.mm[offset : offset + key_len]
-            key = key_bytes.decode('utf-8')
-            offset += key_len
-
-            # 3. Read value Length
-            val_len_bytes = self.mm[offset : offset + 4]
-            val_len = struct.unpack('>I', val_len_bytes)[0]
-            offset += 4
-
-            # 4. Read Value
-            val_bytes = self.mm[offset : offset + val_len]
-            val = val_bytes.decode('utf-8')
-            offset += val_len
-
-            yield key, val
-
-    def search(self, search_key: str) -> Optional[str]:
+        with self._pinned(ACCESS_SEQUENTIAL) as read:
+            offset = 0
+            while offset < self.file_size:
+                # 1. Read Key Length
+                key_len = struct.unpack('>I', read(offset, 4))[0]
+                offset += 4
+
+                # 2. Read Key
+                key = read(offset, key_len).decode('utf-8')
+                offset += key_len
+
+                # 3. Read value Length
+                val_len = struct.unpack('>I', read(offset, 4))[0]
+                offset += 4
+
+                # 4. Read Value
+                size = val_len & ~BLOB_FLAG
+                val = self._decode_value(val_len, read(offset, size))
+                offset += size
+
+                yield key, val
+
+    def search(self, search_key: str) -> Optional[Union[str, BlobPointer]]:
         """
-        Scans the SSTable for the key.
-        Note: A production system would use a Sparse Index (Bloom Filter) here
-        to avoid scanning, but for this milestone, we implement a linear scan
-        over the memory-mapped buffer.
+        Looks the key up via the sparse index: a binary search finds the
+        block that may hold it, then a short linear scan over that block.
         """
-        offset = 0
-        search_key_bytes = search_key.encode('utf-8')
+        if self._index_keys is None:
+            self._build_index()
 
-        while offset < self.file_size:
-            # 1. Read Key Length (4 bytes)
-            # slicing the mmap object returns bytes without copying if used correctly,
-            # but struct.unpack requires a bytes-like object.
-            key_len_bytes = self.mm[offset : offset + 4]
-            if not key_len_bytes: break
-            key_len = struct.unpack('>I', key_len_bytes)[0]
-            offset += 4
+        search_key_bytes = search_key.encode('utf-8')
+        # UTF-8 byte order matches the str order tables are written in
+        block = bisect_right(self._index_keys, search_key_bytes) - 1
+        if block < 0:
+            return None
+        offset = self._index_offsets[block]
 
-            # 2. Read Key
-            current_key = self.mm[offset : offset + key_len]
-            offset += key_len
+        with self._pinned(ACCESS_RANDOM) as read:
+            while offset < self.file_size:
+                # 1. Read Key Length (4 bytes) + Key
+                key_len = struct.unpack('>I', read(offset, 4))[0]
+                current_key = read(offset + 4, key_len)
+                offset += 4 + key_len
 
-            # 3. Read Value Length
-            val_len_bytes = self.mm[offset : offset + 4]
-            val_len = struct.unpack('>I', val_len_bytes)[0]
-            offset += 4
+                # 2. Read Value Length
+                val_len = struct.unpack('>I', read(offset, 4))[0]
+                offset += 4
+                size = val_len & ~BLOB_FLAG
 
-            # 4. Read Value (only if key matches, otherwise just skip)
-            if current_key == search_key_bytes:
-                val_bytes = self.mm[offset : offset + val_len]
-                return val_bytes.decode('utf-8')
+                # 3. Read Value (only if key matches, otherwise just skip)
+                if current_key == search_key_bytes:
+                    return self._decode_value(val_len, read(offset, size))
+                if current_key > search_key_bytes:
+                    return None # Keys are sorted: it isn't here
 
-            # Skip value to get to next record
-            offset += val_len
+                # Skip value to get to next record
+                offset += size
 
         return None
-    
+
+    def _build_index(self) -> None:
+        """One sequential pass over the keys; the index outlives evicted handles."""
+        keys, offsets = [], []
+        next_block = 0
+        with self._pinned(ACCESS_SEQUENTIAL) as read:
+            offset = 0
+            while offset < self.file_size:
+                key_len = struct.unpack('>I', read(offset, 4))[0]
+                if offset >= next_block:
+                    keys.append(read(offset + 4, key_len))
+                    offsets.append(offset)
+                    next_block = offset + self.INDEX_INTERVAL
+                val_offset = offset + 4 + key_len
+                val_len = struct.unpack('>I', read(val_offset, 4))[0]
+                offset = val_offset + 4 + (val_len & ~BLOB_FLAG)
+        self._index_offsets = offsets
+        self._index_keys = keys
+
+    @staticmethod
+    def _decode_value(val_len: int, val_bytes: bytes) -> Union[str, BlobPointer]:
+        """Inline values are UTF-8; flagged ones are pointers into a blob file."""
+        if val_len & BLOB_FLAG:
+            return BlobPointer.decode(val_bytes)
+        return val_bytes.decode('utf-8')
+
     def close(self):
-        self.mm.close()
-        self.file.close()
+        # Cached handles belong to the cache (other readers of the same file
+        # may share them); whoever deletes the file evicts it.
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
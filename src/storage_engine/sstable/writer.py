@@ -1,6 +1,9 @@
 import struct
-from typing import Any
+from typing import Any, Optional, Union
 from src.storage_engine.memtable.skiplist import SkipList
+from src.storage_engine.rate_limiter import RateLimiter, IO_PRIORITY_HIGH
+from src.storage_engine.blob.pointer import BlobPointer, BLOB_FLAG
+from src.storage_engine.blob.writer import BlobFileWriter
 
 
 class SSTableWriter:
@@ -8,6 +11,27 @@ class SSTableWriter:
     Flushes a MemTable (SkipList) to disk as an immutable SSTable.
     """
 
+    # Bytes accumulated before asking the rate limiter for tokens.
+    # Charging every record would make the limiter lock the hot path.
+    RATE_LIMIT_CHUNK = 64 * 1024
+
+    def __init__(self, rate_limiter: Optional[RateLimiter] = None, io_priority: int = IO_PRIORITY_HIGH,
+                 blob_writer: Optional[BlobFileWriter] = None, min_blob_size: int = 0):
+        """
+        Args:
+            rate_limiter: Optional token bucket shared with other background writers.
+            io_priority: Priority used when requesting tokens (flushes are high).
+            blob_writer: If set, values of at least `min_blob_size` bytes are
+                         appended to this blob file and the SSTable only
+                         stores a BlobPointer.
+            min_blob_size: Size threshold (encoded bytes) for blob separation.
+        """
+        self.rate_limiter = rate_limiter
+        self.io_priority = io_priority
+        self.blob_writer = blob_writer
+        self.min_blob_size = min_blob_size
+        self._uncharged = 0
+
     def write(self, memtable: SkipList, filepath: str) -> None:
         """
         Iterates through the MemTable and writes key-value pairs to the file.
@@ -19,20 +43,46 @@ class SSTableWriter:
         with open(filepath, "wb") as f:
             # The memtable iterator yields (key, value) in strictly sorted order
             for key, value in memtable:
+                if self.blob_writer is not None and len(value.encode('utf-8')) >= self.min_blob_size:
+                    start = self.blob_writer.offset
+                    value = self.blob_writer.add(key, value)
+                    self._charge(self.blob_writer.offset - start)
                 self._write_pair(f, key, value)
+        self._drain()
 
-    def _write_pair(self, file_obj, key: str, value: str) -> None:
+    def _write_pair(self, file_obj, key: str, value: Union[str, BlobPointer]) -> None:
         """Helper to serialize and write a single pair."""
         # Convert to bytes
         key_bytes = key.encode('utf-8')
-        val_bytes = value.encode('utf-8')
+        if isinstance(value, BlobPointer):
+            val_bytes = value.encode()
+            val_len = len(val_bytes) | BLOB_FLAG
+        else:
+            val_bytes = value.encode('utf-8')
+            val_len = len(val_bytes)
 
         # Pack integers (4 bytes, Big Endian)
         k_len = struct.pack('>I', len(key_bytes))
-        v_len = struct.pack('>I', len(val_bytes))
+        v_len = struct.pack('>I', val_len)
 
         # Sequential write: Lengths first, then Data
         file_obj.write(k_len)
         file_obj.write(key_bytes)
         file_obj.write(v_len)
         file_obj.write(val_bytes)
+
+        self._charge(8 + len(key_bytes) + len(val_bytes))
+
+    def _charge(self, num_bytes: int) -> None:
+        """Accounts written bytes against the rate limiter in RATE_LIMIT_CHUNK steps."""
+        if self.rate_limiter is None:
+            return
+        self._uncharged += num_bytes
+        if self._uncharged >= self.RATE_LIMIT_CHUNK:
+            self._drain()
+
+    def _drain(self) -> None:
+        """Charges whatever is left over (call once the file is complete)."""
+        if self.rate_limiter is not None and self._uncharged:
+            self.rate_limiter.request(self._uncharged, self.io_priority)
+        self._uncharged = 0
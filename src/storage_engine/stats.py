@@ -0,0 +1,49 @@
+class EngineStats:
+    """
+    Cumulative counters for a StorageEngine instance.
+
+    Attributes:
+        user_bytes_written: Key + value bytes accepted by `put`.
+        flush_bytes_written: Bytes of SSTables and blob files produced by MemTable flushes.
+        compaction_bytes_written: Bytes of SSTables produced by compaction.
+        compactions: Number of completed compaction jobs.
+        write_stalls: Number of `put` calls that were delayed or stopped.
+        write_stall_seconds: Total time `put` spent in write stalls.
+        blob_files_deleted: Blob files reclaimed by the garbage collector.
+        blob_bytes_relocated: Live blob bytes rewritten by the garbage collector.
+    """
+    __slots__ = (
+        'user_bytes_written',
+        'flush_bytes_written',
+        'compaction_bytes_written',
+        'compactions',
+        'write_stalls',
+        'write_stall_seconds',
+        'blob_files_deleted',
+        'blob_bytes_relocated',
+    )
+
+    def __init__(self):
+        self.user_bytes_written = 0
+        self.flush_bytes_written = 0
+        self.compaction_bytes_written = 0
+        self.compactions = 0
+        self.write_stalls = 0
+        self.write_stall_seconds = 0.0
+        self.blob_files_deleted = 0
+        self.blob_bytes_relocated = 0
+
+    @property
+    def write_amplification(self) -> float:
+        """SSTable and blob bytes written to disk per byte of user data."""
+        if self.user_bytes_written == 0:
+            return 0.0
+        disk_bytes = self.flush_bytes_written + self.compaction_bytes_written
+        return disk_bytes / self.user_bytes_written
+
+    def __repr__(self):
+        return (
+            f"EngineStats(user={self.user_bytes_written}, flush={self.flush_bytes_written}, "
+            f"compaction={self.compaction_bytes_written}, wa={self.write_amplification:.2f}, "
+            f"stall={self.write_stall_seconds:.3f}s)"
+        )
@@ -0,0 +1,31 @@
+import time
+from typing import Optional, Tuple
+
+
+# Every value stored by a TTL-enabled engine starts with its expiry time:
+# [Expiry (13 digits, epoch milliseconds)][Value]. 0 means "never expires".
+EXPIRY_WIDTH = 13
+NO_EXPIRY = 0
+
+
+def expiry_for(ttl: Optional[float], now: Optional[float] = None) -> int:
+    """Absolute expiry (epoch ms) for a TTL in seconds, or NO_EXPIRY."""
+    if ttl is None:
+        return NO_EXPIRY
+    if ttl <= 0:
+        raise ValueError("ttl must be positive")
+    now = time.time() if now is None else now
+    return int((now + ttl) * 1000)
+
+def encode(value: str, expires_at: int) -> str:
+    return f"{expires_at:0{EXPIRY_WIDTH}d}{value}"
+
+def decode(raw: str) -> Tuple[int, str]:
+    """Splits a stored value into (expires_at, value)."""
+    return int(raw[:EXPIRY_WIDTH]), raw[EXPIRY_WIDTH:]
+
+def is_expired(expires_at: int, now: Optional[float] = None) -> bool:
+    if expires_at == NO_EXPIRY:
+        return False
+    now = time.time() if now is None else now
+    return expires_at <= int(now * 1000)
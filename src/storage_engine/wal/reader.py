@@ -0,0 +1,53 @@
+import os
+import struct
+from typing import Generator, Optional, Tuple
+
+
+class WALReader:
+    """
+    Reads records written by WALLogger.
+    Format: [Key Size (4B)][Key][Value Size (4B)][Value]
+
+    The log may be appended to concurrently (or torn by a crash), so an
+    incomplete record at the end is not an error: reading simply stops
+    before it, and `offset` tells where to resume later.
+
+    A log that is being tailed can also be rotated away. `inode` records
+    which file was actually read; if `expected_inode` is given and the path
+    now points at a different file, nothing is yielded.
+    """
+
+    def __init__(self, path: str, offset: int = 0, expected_inode: Optional[int] = None):
+        self.path = path
+        self.offset = offset
+        self.expected_inode = expected_inode
+        self.inode: Optional[int] = None
+
+    def __iter__(self) -> Generator[Tuple[str, str], None, None]:
+        with open(self.path, "rb") as f:
+            self.inode = os.fstat(f.fileno()).st_ino
+            if self.expected_inode is not None and self.inode != self.expected_inode:
+                return
+            f.seek(self.offset)
+            data = f.read()
+
+        base = self.offset
+        pos = 0
+        while pos + 4 <= len(data):
+            # 1. Key Length + Key
+            key_len = struct.unpack('>I', data[pos : pos + 4])[0]
+            val_start = pos + 4 + key_len
+            if val_start + 4 > len(data):
+                break
+
+            # 2. Value Length + Value
+            val_len = struct.unpack('>I', data[val_start : val_start + 4])[0]
+            end = val_start + 4 + val_len
+            if end > len(data):
+                break
+
+            key = data[pos + 4 : val_start].decode('utf-8')
+            value = data[val_start + 4 : end].decode('utf-8')
+            pos = end
+            self.offset = base + pos
+            yield key, value
@@ -0,0 +1,47 @@
+from typing import Tuple
+from src.storage_engine.config import StorageConfig
+
+
+class WriteController:
+    """
+    Turns LSM shape metrics into backpressure for foreground writes.
+
+    Each metric has a slowdown and a stop threshold. Between the two, every
+    `put` is delayed by a fraction of `max_write_delay` that grows linearly
+    with how far the worst metric has progressed towards its stop threshold.
+    At the stop threshold writes block until background work catches up.
+    """
+
+    def __init__(self, config: StorageConfig):
+        self.max_delay = config.max_write_delay
+        self.thresholds = {
+            'l0_files': (config.level0_slowdown_writes_trigger,
+                         config.level0_stop_writes_trigger),
+            'immutable_memtables': (config.immutable_memtable_slowdown_trigger,
+                                    config.immutable_memtable_stop_trigger),
+            'pending_compaction_bytes': (config.soft_pending_compaction_bytes_limit,
+                                         config.hard_pending_compaction_bytes_limit),
+        }
+
+    def evaluate(self, l0_files: int, immutable_memtables: int,
+                 pending_compaction_bytes: int) -> Tuple[bool, float]:
+        """
+        Returns:
+            (stopped, delay_seconds) for the next write.
+        """
+        metrics = {
+            'l0_files': l0_files,
+            'immutable_memtables': immutable_memtables,
+            'pending_compaction_bytes': pending_compaction_bytes,
+        }
+
+        pressure = 0.0
+        for name, value in metrics.items():
+            slowdown, stop = self.thresholds[name]
+            if value >= stop:
+                return True, self.max_delay
+            if value >= slowdown:
+                # +1 so that merely reaching the slowdown threshold already delays
+                pressure = max(pressure, (value - slowdown + 1) / (stop - slowdown + 1))
+
+        return False, pressure * self.max_delay
@@ -0,0 +1,7 @@
+import pytest
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """Directory for a fresh database (created by the engine)."""
+    return str(tmp_path / "data")
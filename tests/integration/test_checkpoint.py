@@ -0,0 +1,66 @@
+import os
+import pytest
+from src.storage_engine.engine import StorageEngine
+from src.storage_engine.config import StorageConfig
+
+
+def test_engine_reopens_flushed_data(tmp_path):
+    db_path = str(tmp_path / "data")
+    engine = StorageEngine(db_path, memtable_max_size=2)
+    for i in range(6):
+        engine.put(f"key:{i}", f"v{i}")
+    engine.close()
+
+    reopened = StorageEngine(db_path, memtable_max_size=2)
+    for i in range(6):
+        assert reopened.get(f"key:{i}") == f"v{i}"
+    reopened.close()
+
+def test_checkpoint_hard_links_sstables_and_opens_as_engine(tmp_path):
+    db_path = str(tmp_path / "data")
+    cp_path = str(tmp_path / "checkpoint")
+    config = StorageConfig(level0_file_num_compaction_trigger=2)
+    engine = StorageEngine(db_path, memtable_max_size=3, config=config)
+    for i in range(10):
+        engine.put(f"key:{i}", f"v{i}") # key:9 only lives in the MemTable/WAL
+
+    engine.checkpoint(cp_path)
+
+    # SSTables are shared with the live database, not copied
+    sst_files = [f for f in os.listdir(cp_path) if f.endswith(".sst")]
+    assert sst_files
+    for name in sst_files:
+        assert os.path.samefile(os.path.join(cp_path, name), os.path.join(db_path, name))
+    assert "MANIFEST" in os.listdir(cp_path)
+
+    # Later writes and compactions in the live database don't leak in
+    for i in range(10):
+        engine.put(f"key:{i}", "changed")
+    engine.close()
+
+    snapshot = StorageEngine(cp_path, memtable_max_size=3, config=config)
+    for i in range(10):
+        assert snapshot.get(f"key:{i}") == f"v{i}"
+    # And the checkpoint is a normal, writable engine
+    snapshot.put("key:new", "x")
+    assert snapshot.get("key:new") == "x"
+    snapshot.close()
+
+def test_checkpoint_includes_blob_files(tmp_path):
+    config = StorageConfig(enable_blob_files=True, min_blob_size=100)
+    engine = StorageEngine(str(tmp_path / "data"), config=config)
+    engine.put("large", "L" * 500)
+    engine.checkpoint(str(tmp_path / "cp"))
+    engine.close()
+
+    assert any(f.endswith(".blob") for f in os.listdir(str(tmp_path / "cp")))
+    snapshot = StorageEngine(str(tmp_path / "cp"), config=config)
+    assert snapshot.get("large") == "L" * 500
+    snapshot.close()
+
+def test_checkpoint_refuses_existing_directory(tmp_path):
+    engine = StorageEngine(str(tmp_path / "data"))
+    os.makedirs(str(tmp_path / "cp"))
+    with pytest.raises(FileExistsError):
+        engine.checkpoint(str(tmp_path / "cp"))
+    engine.close()
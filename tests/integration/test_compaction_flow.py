@@ -0,0 +1,62 @@
+import os
+import pytest
+from src.storage_engine.engine import StorageEngine
+from src.storage_engine.config import StorageConfig, COMPACTION_LEVELED, COMPACTION_TIERED
+from src.storage_engine.rate_limiter import IO_PRIORITY_HIGH, IO_PRIORITY_LOW
+
+
+@pytest.mark.parametrize("strategy", [COMPACTION_LEVELED, COMPACTION_TIERED])
+def test_engine_compacts_and_keeps_latest_values(tmp_path, strategy):
+    """
+    Writes enough data to trigger several compactions, including overwrites,
+    and verifies every key still resolves to its most recent value.
+    """
+    db_path = str(tmp_path / "data")
+    config = StorageConfig(
+        compaction_strategy=strategy,
+        level0_file_num_compaction_trigger=3,
+        max_bytes_for_level_base=200,
+    )
+    engine = StorageEngine(db_path, memtable_max_size=4, config=config)
+
+    for i in range(60):
+        engine.put(f"key:{i % 20:03d}", f"v{i}")
+
+    assert engine.stats.compactions > 0
+    # Compaction removed the input files
+    sst_files = [f for f in os.listdir(db_path) if f.endswith(".sst")]
+    assert len(sst_files) == len(engine.sst_readers)
+
+    for k in range(20):
+        assert engine.get(f"key:{k:03d}") == f"v{k + 40}"
+
+    assert engine.stats.write_amplification > 1.0
+    engine.close()
+
+def test_tiered_writes_less_than_leveled(tmp_path):
+    """Tiered compaction exists to lower write amplification."""
+    results = {}
+    for strategy in (COMPACTION_LEVELED, COMPACTION_TIERED):
+        config = StorageConfig(
+            compaction_strategy=strategy,
+            max_bytes_for_level_base=2000,
+        )
+        engine = StorageEngine(str(tmp_path / strategy), memtable_max_size=5, config=config)
+        for i in range(1000):
+            engine.put(f"key:{i:05d}", "x" * 20)
+        results[strategy] = engine.stats.write_amplification
+        engine.close()
+
+    assert results[COMPACTION_TIERED] < results[COMPACTION_LEVELED]
+
+def test_engine_rate_limits_background_writes(tmp_path):
+    config = StorageConfig(rate_limit_bytes_per_sec=10_000_000, level0_file_num_compaction_trigger=2)
+    engine = StorageEngine(str(tmp_path / "data"), memtable_max_size=2, config=config)
+
+    for i in range(10):
+        engine.put(f"key:{i}", "value")
+
+    limiter = engine.rate_limiter
+    assert limiter.bytes_through[IO_PRIORITY_HIGH] == engine.stats.flush_bytes_written
+    assert limiter.bytes_through[IO_PRIORITY_LOW] == engine.stats.compaction_bytes_written
+    engine.close()
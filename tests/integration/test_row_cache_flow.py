@@ -0,0 +1,72 @@
+import time
+from src.storage_engine.engine import StorageEngine
+from src.storage_engine.config import StorageConfig
+from src.storage_engine.compaction.filter import CompactionFilter, CHANGE_VALUE, KEEP
+
+
+def test_repeated_gets_are_served_from_row_cache(db_path):
+    engine = StorageEngine(db_path, memtable_max_size=2, config=StorageConfig(row_cache_size=64 * 1024))
+    engine.put("hot", "value")
+    engine.put("other", "x") # Flushes "hot" to disk
+
+    for _ in range(10):
+        assert engine.get("hot") == "value"
+        assert engine.get("missing") is None
+
+    assert engine.row_cache.misses == 2
+    assert engine.row_cache.hits == 18
+    assert engine.row_cache.negative_hits == 9
+    engine.close()
+
+def test_put_invalidates_cached_and_negative_entries(db_path):
+    engine = StorageEngine(db_path, config=StorageConfig(row_cache_size=64 * 1024))
+    assert engine.get("k") is None # Cached as negative
+    engine.put("k", "v1")
+    assert engine.get("k") == "v1"
+    engine.put("k", "v2")
+    assert engine.get("k") == "v2"
+    engine.close()
+
+def test_compaction_does_not_change_cached_results(db_path):
+    config = StorageConfig(row_cache_size=64 * 1024, level0_file_num_compaction_trigger=2)
+    engine = StorageEngine(db_path, memtable_max_size=2, config=config)
+    for i in range(6):
+        engine.put(f"key:{i % 3}", f"v{i}")
+    before = {k: engine.get(k) for k in ("key:0", "key:1", "key:2", "nope")}
+
+    for i in range(8):
+        engine.put(f"filler:{i}", "f")
+    assert engine.stats.compactions > 0
+
+    after = {k: engine.get(k) for k in before}
+    assert after == before
+    engine.close()
+
+def test_filter_rewrites_invalidate_cache(db_path):
+    class Redact(CompactionFilter):
+        def filter(self, key, value):
+            if key.startswith("secret:"):
+                return CHANGE_VALUE, "***"
+            return KEEP, None
+
+    config = StorageConfig(row_cache_size=64 * 1024, compaction_filter=Redact(),
+                           level0_file_num_compaction_trigger=2)
+    engine = StorageEngine(db_path, memtable_max_size=2, config=config)
+    engine.put("secret:1", "hunter2")
+    engine.put("a", "1")
+    assert engine.get("secret:1") == "hunter2" # Cached before compaction
+
+    engine.put("b", "2")
+    engine.put("c", "3") # Second flush -> compaction runs the filter
+
+    assert engine.get("secret:1") == "***"
+    engine.close()
+
+def test_cached_ttl_values_still_expire(db_path):
+    config = StorageConfig(row_cache_size=64 * 1024, ttl_enabled=True)
+    engine = StorageEngine(db_path, config=config)
+    engine.put("session", "data", ttl=0.05)
+    assert engine.get("session") == "data"
+    time.sleep(0.1)
+    assert engine.get("session") is None
+    engine.close()
@@ -1,11 +1,6 @@
 import os
-import pytest
 from src.storage_engine.engine import StorageEngine
 
-@pytest.fixture
-def db_path(tmp_path):
-    return str(tmp_path / "data")
-
 def test_engine_write_path_integration(db_path):
     """
     Verifies that 'put' writes to BOTH the MemTable and the WAL file.
@@ -0,0 +1,76 @@
+import pytest
+from src.storage_engine.engine import StorageEngine
+from src.storage_engine.config import StorageConfig, READ_MODE_MMAP, READ_MODE_PREAD
+from src.storage_engine.compaction.strategy import create_compaction_strategy
+
+
+@pytest.mark.parametrize("read_mode", [READ_MODE_MMAP, READ_MODE_PREAD])
+def test_open_files_stay_bounded(tmp_path, read_mode):
+    config = StorageConfig(max_open_files=2, sstable_read_mode=read_mode,
+                           level0_file_num_compaction_trigger=100)
+    engine = StorageEngine(str(tmp_path / "data"), memtable_max_size=2, config=config)
+    for i in range(20):
+        engine.put(f"key:{i}", f"v{i}")
+    assert len(engine.sst_readers) == 10
+
+    for _ in range(2):
+        for i in range(20):
+            assert engine.get(f"key:{i}") == f"v{i}"
+    assert len(engine.table_cache) <= 2
+    assert engine.table_cache.evictions > 0
+
+    # Compaction deletes tables, evicting their handles
+    engine.compaction_strategy = create_compaction_strategy(StorageConfig(level0_file_num_compaction_trigger=2))
+    engine.compact()
+    assert len(engine.sst_readers) < 10
+    for i in range(20):
+        assert engine.get(f"key:{i}") == f"v{i}"
+    assert len(engine.table_cache) <= 2
+    engine.close()
+
+def test_read_only_instance_keeps_compacted_tables_readable(tmp_path):
+    db_path = str(tmp_path / "data")
+    primary = StorageEngine(db_path, memtable_max_size=1)
+    for i in range(6):
+        primary.put(f"k{i}", f"v{i}")
+
+    secondary = StorageEngine.open_read_only(db_path, config=StorageConfig(max_open_files=1))
+    for i in range(4):
+        primary.put(f"n{i}", f"v{i}")
+    assert primary.stats.compactions > 0 # Deleted tables the secondary still lists
+
+    for i in range(6):
+        assert secondary.get(f"k{i}") == f"v{i}"
+    secondary.try_catch_up_with_primary()
+    assert secondary.get("n3") == "v3"
+    secondary.close()
+    primary.close()
+
+def test_compaction_inputs_count_against_open_files(tmp_path):
+    config = StorageConfig(max_open_files=2, level0_file_num_compaction_trigger=100)
+    engine = StorageEngine(str(tmp_path / "data"), memtable_max_size=2, config=config)
+    for i in range(12):
+        engine.put(f"key:{i}", f"v{i}")
+    for i in range(12):
+        assert engine.get(f"key:{i}") == f"v{i}"
+
+    open_during_merge = []
+    write_merged = engine.compactor._write_merged
+
+    def record(iterator, *args):
+        def watched():
+            for item in iterator:
+                open_during_merge.append(len(engine.table_cache))
+                yield item
+        return write_merged(watched(), *args)
+
+    engine.compactor._write_merged = record
+    engine.compaction_strategy = create_compaction_strategy(StorageConfig(level0_file_num_compaction_trigger=2))
+    engine.compact()
+
+    # The 6 inputs are pinned in the cache (over the cap only while merging)
+    assert max(open_during_merge) == 6
+    assert len(engine.table_cache) <= 2
+    for i in range(12):
+        assert engine.get(f"key:{i}") == f"v{i}"
+    engine.close()
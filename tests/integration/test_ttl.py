@@ -0,0 +1,63 @@
+import time
+import pytest
+from src.storage_engine.engine import StorageEngine
+from src.storage_engine.config import StorageConfig
+
+
+def test_expired_values_are_hidden_on_read(db_path):
+    engine = StorageEngine(db_path, memtable_max_size=2, config=StorageConfig(ttl_enabled=True))
+
+    engine.put("session:1", "short", ttl=0.05)
+    engine.put("session:2", "long", ttl=3600)
+    engine.put("config:1", "forever")
+
+    time.sleep(0.1)
+    assert engine.get("session:1") is None # Expired (on disk)
+    assert engine.get("session:2") == "long"
+    assert engine.get("config:1") == "forever" # From RAM
+    engine.close()
+
+def test_expired_values_are_dropped_by_compaction(db_path):
+    config = StorageConfig(ttl_enabled=True, level0_file_num_compaction_trigger=2)
+    engine = StorageEngine(db_path, memtable_max_size=2, config=config)
+
+    for i in range(4):
+        engine.put(f"session:{i}", "data", ttl=0.05)
+    time.sleep(0.1)
+    # Two more flushes: L0 + L1 get merged again, now after the sessions expired
+    for i in range(4):
+        engine.put(f"user:{i}", "alice")
+
+    # The bottommost merge removed every expired session without any delete
+    keys = [k for reader in engine.sst_readers for k, _ in reader]
+    assert keys == ["user:0", "user:1", "user:2", "user:3"]
+    assert engine.get("user:1") == "alice"
+    engine.close()
+
+def test_default_ttl_applies_to_plain_puts(db_path):
+    engine = StorageEngine(db_path, config=StorageConfig(ttl_enabled=True, default_ttl=0.05))
+    engine.put("k", "v")
+    assert engine.get("k") == "v"
+    time.sleep(0.1)
+    assert engine.get("k") is None
+    engine.close()
+
+def test_ttl_requires_ttl_enabled_engine(db_path):
+    engine = StorageEngine(db_path)
+    with pytest.raises(ValueError):
+        engine.put("k", "v", ttl=10)
+    engine.close()
+
+def test_value_format_mismatch_is_refused(db_path):
+    engine = StorageEngine(db_path)
+    engine.put("k", "1234567890123 looks like an expiry")
+    engine.close()
+
+    with pytest.raises(ValueError):
+        StorageEngine(db_path, config=StorageConfig(ttl_enabled=True))
+    with pytest.raises(ValueError):
+        StorageEngine.open_read_only(db_path, config=StorageConfig(ttl_enabled=True))
+
+    engine = StorageEngine(db_path)
+    assert engine.get("k") == "1234567890123 looks like an expiry"
+    engine.close()
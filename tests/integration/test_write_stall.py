@@ -0,0 +1,94 @@
+import os
+import threading
+import pytest
+from src.storage_engine.engine import StorageEngine
+from src.storage_engine.config import StorageConfig, COMPACTION_TIERED
+
+
+def test_background_jobs_flush_and_compact(tmp_path):
+    db_path = str(tmp_path / "data")
+    config = StorageConfig(background_jobs=True, level0_file_num_compaction_trigger=2)
+    engine = StorageEngine(db_path, memtable_max_size=2, config=config)
+
+    for i in range(40):
+        engine.put(f"key:{i % 10}", f"v{i}")
+    engine.flush()
+
+    assert not engine.immutable_memtables
+    for k in range(10):
+        assert engine.get(f"key:{k}") == f"v{k + 30}"
+
+    engine.close()
+    # Only the active WAL is left once every frozen MemTable is on disk
+    assert [f for f in os.listdir(db_path) if f.endswith(".wal")] == ["recovery.wal"]
+
+def test_put_is_delayed_when_background_work_falls_behind(tmp_path):
+    """
+    A slow (rate limited) background lets L0 pile up. Writes must be slowed
+    down and the stall time recorded, without losing any data.
+    """
+    config = StorageConfig(
+        background_jobs=True,
+        rate_limit_bytes_per_sec=20_000,
+        level0_file_num_compaction_trigger=2,
+        level0_slowdown_writes_trigger=2,
+        level0_stop_writes_trigger=4,
+        immutable_memtable_slowdown_trigger=1,
+        immutable_memtable_stop_trigger=3,
+        max_write_delay=0.01,
+    )
+    engine = StorageEngine(str(tmp_path / "data"), memtable_max_size=5, config=config)
+
+    for i in range(100):
+        engine.put(f"key:{i:04d}", "x" * 50)
+
+    assert engine.stats.write_stalls > 0
+    assert engine.stats.write_stall_seconds > 0
+    assert len(engine.immutable_memtables) <= config.immutable_memtable_stop_trigger
+
+    for i in range(100):
+        assert engine.get(f"key:{i:04d}") == "x" * 50
+    engine.close()
+
+def test_compact_waits_for_background_compaction(tmp_path):
+    """Foreground compact() must not run the job the compaction thread is already merging."""
+    config = StorageConfig(background_jobs=True, level0_file_num_compaction_trigger=2)
+    engine = StorageEngine(str(tmp_path / "data"), memtable_max_size=2, config=config)
+
+    for i in range(300):
+        engine.put(f"key:{i % 40}", f"v{i}")
+        if i % 4 == 3:
+            engine.compact()
+            assert engine.compaction_strategy.pick(engine.levels) is None
+
+    for k in range(40):
+        last = max(i for i in range(300) if i % 40 == k)
+        assert engine.get(f"key:{k}") == f"v{last}"
+    engine.close()
+
+def test_tiered_stop_trigger_does_not_block_forever(tmp_path):
+    """Runs too different in size to merge by ratio must not stall writes for good."""
+    config = StorageConfig(
+        background_jobs=True,
+        compaction_strategy=COMPACTION_TIERED,
+        level0_file_num_compaction_trigger=2,
+        level0_slowdown_writes_trigger=3,
+        level0_stop_writes_trigger=4,
+    )
+    engine = StorageEngine(str(tmp_path / "data"), memtable_max_size=1, config=config)
+
+    def write():
+        for i, size in enumerate([4000, 1000, 250, 60, 15]):
+            engine.put(f"key:{i}", "x" * size)
+            engine.flush() # One run per put
+
+    writer = threading.Thread(target=write, daemon=True)
+    writer.start()
+    writer.join(timeout=10)
+    assert not writer.is_alive()
+
+    engine.flush()
+    engine.compact() # Waits for the compaction thread
+    assert len(engine.levels[0]) <= config.level0_file_num_compaction_trigger
+    assert engine.get("key:0") == "x" * 4000
+    engine.close()
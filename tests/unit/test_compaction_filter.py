@@ -0,0 +1,78 @@
+import pytest
+from src.storage_engine import ttl
+from src.storage_engine.memtable.skiplist import SkipList
+from src.storage_engine.sstable.writer import SSTableWriter
+from src.storage_engine.sstable.reader import SSTableReader
+from src.storage_engine.compaction.merger import Compactor
+from src.storage_engine.compaction.filter import (
+    CompactionFilter,
+    TtlCompactionFilter,
+    KEEP,
+    REMOVE,
+    CHANGE_VALUE,
+)
+
+
+class DropTempUppercaseRest(CompactionFilter):
+    """Drops "tmp:" keys and upper-cases every other value."""
+    def __init__(self):
+        self.seen = []
+
+    def filter(self, key, value):
+        self.seen.append((key, value))
+        if key.startswith("tmp:"):
+            return REMOVE, None
+        return CHANGE_VALUE, value.upper()
+
+def write_sst(path, pairs):
+    mem = SkipList()
+    for k, v in pairs:
+        mem.insert(k, v)
+    SSTableWriter().write(mem, str(path))
+    return str(path)
+
+def test_filter_sees_only_surviving_versions(tmp_path):
+    old = write_sst(tmp_path / "1.sst", [("user:1", "alice"), ("tmp:1", "x")])
+    new = write_sst(tmp_path / "2.sst", [("user:1", "alice_v2")])
+    compaction_filter = DropTempUppercaseRest()
+
+    out = str(tmp_path / "out.sst")
+    Compactor(compaction_filter=compaction_filter).merge([old, new], out)
+
+    # Called once per key, with the newest value only
+    assert compaction_filter.seen == [("tmp:1", "x"), ("user:1", "alice_v2")]
+    reader = SSTableReader(out)
+    assert list(reader) == [("user:1", "ALICE_V2")]
+    reader.close()
+
+def test_filter_removal_skipped_when_not_bottommost(tmp_path):
+    """Dropping the key would let an older version outside the merge resurface."""
+    path = write_sst(tmp_path / "1.sst", [("tmp:1", "x")])
+
+    out = str(tmp_path / "out.sst")
+    Compactor(compaction_filter=DropTempUppercaseRest()).merge([path], out, bottommost=False)
+
+    reader = SSTableReader(out)
+    assert reader.search("tmp:1") == "x"
+    reader.close()
+
+def test_ttl_filter_drops_expired_values():
+    now = 1_000_000.0
+    ttl_filter = TtlCompactionFilter(clock=lambda: now)
+
+    expired = ttl.encode("old", ttl.expiry_for(10, now=now - 60))
+    live = ttl.encode("new", ttl.expiry_for(10, now=now))
+    forever = ttl.encode("keep", ttl.NO_EXPIRY)
+
+    assert ttl_filter.filter("k", expired) == (REMOVE, None)
+    assert ttl_filter.filter("k", live) == (KEEP, None)
+    assert ttl_filter.filter("k", forever) == (KEEP, None)
+
+def test_ttl_filter_preserves_expiry_on_rewrite():
+    expires_at = ttl.expiry_for(3600)
+    ttl_filter = TtlCompactionFilter(inner=DropTempUppercaseRest())
+
+    decision, new_value = ttl_filter.filter("user:1", ttl.encode("alice", expires_at))
+
+    assert decision == CHANGE_VALUE
+    assert ttl.decode(new_value) == (expires_at, "ALICE")
@@ -0,0 +1,82 @@
+import pytest
+from types import SimpleNamespace
+from src.storage_engine.config import StorageConfig
+from src.storage_engine.compaction.strategy import (
+    LeveledCompactionStrategy,
+    TieredCompactionStrategy,
+    create_compaction_strategy,
+)
+
+
+def run(size, name="run"):
+    """Stand-in for an SSTableReader: strategies only look at path and size."""
+    return SimpleNamespace(filepath=f"{name}.sst", file_size=size)
+
+def test_leveled_pushes_l0_into_l1():
+    config = StorageConfig(level0_file_num_compaction_trigger=2)
+    strategy = LeveledCompactionStrategy(config)
+    l1 = run(500, "l1")
+    a, b = run(10, "a"), run(10, "b")
+
+    job = strategy.pick([[a, b], [l1]])
+
+    # L1 is older than L0, so it comes first in the merge order
+    assert job.inputs == [l1, a, b]
+    assert job.output_level == 1
+
+def test_leveled_spills_oversized_level():
+    config = StorageConfig(max_bytes_for_level_base=100)
+    strategy = LeveledCompactionStrategy(config)
+    l1 = run(150, "l1")
+
+    job = strategy.pick([[], [l1]])
+
+    assert job.inputs == [l1]
+    assert job.output_level == 2
+
+def test_tiered_waits_for_trigger():
+    strategy = TieredCompactionStrategy(StorageConfig(level0_file_num_compaction_trigger=4))
+    assert strategy.pick([[run(100), run(100), run(100)]]) is None
+
+def test_tiered_merges_similar_sized_runs():
+    """
+    Runs (oldest -> newest): 1000, 400, 10, 10, 10
+    The three small runs are similar in size and get merged; the large
+    older runs are left alone (no rewrite of cold data).
+    """
+    config = StorageConfig(level0_file_num_compaction_trigger=4, size_ratio=1)
+    strategy = TieredCompactionStrategy(config)
+    runs = [run(1000), run(400), run(10), run(10), run(10)]
+
+    job = strategy.pick([runs])
+
+    assert job.inputs == runs[2:]
+    assert job.output_level == 0
+
+def test_tiered_space_amplification_triggers_full_merge():
+    config = StorageConfig(level0_file_num_compaction_trigger=2, max_size_amplification_percent=50)
+    strategy = TieredCompactionStrategy(config)
+    runs = [run(100), run(80)]
+
+    job = strategy.pick([runs])
+
+    assert job.inputs == runs
+
+def test_tiered_reduces_run_count_when_no_runs_are_similar():
+    """
+    Runs (oldest -> newest): 4000, 1000, 250, 60
+    Each run is 4x the next one, so no size-ratio window exists. Above the
+    trigger the newest runs are merged anyway, back down to the trigger.
+    """
+    config = StorageConfig(level0_file_num_compaction_trigger=2)
+    strategy = TieredCompactionStrategy(config)
+    runs = [run(4000), run(1000), run(250), run(60)]
+
+    job = strategy.pick([runs])
+
+    assert job.inputs == runs[1:]
+    assert strategy.pick([runs[:2]]) is None # At the trigger: wait for a better merge
+
+def test_unknown_strategy_rejected():
+    with pytest.raises(ValueError):
+        create_compaction_strategy(StorageConfig(compaction_strategy="bogus"))
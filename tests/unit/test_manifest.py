@@ -0,0 +1,22 @@
+import os
+import pytest
+from src.storage_engine.manifest import Manifest, MANIFEST_NAME
+
+
+def test_manifest_roundtrip(tmp_path):
+    manifest = Manifest(levels=[["000005.sst"], [], ["000001.sst"]], blob_files=["000002.blob"], next_file_number=6)
+    manifest.save(str(tmp_path))
+
+    loaded = Manifest.load(str(tmp_path))
+    assert loaded.levels == [["000005.sst"], [], ["000001.sst"]]
+    assert loaded.blob_files == ["000002.blob"]
+    assert loaded.next_file_number == 6
+    # Atomic replace leaves no temp file behind
+    assert os.listdir(str(tmp_path)) == [MANIFEST_NAME]
+
+def test_manifest_missing(tmp_path):
+    assert Manifest.load(str(tmp_path)) is None
+
+def test_manifest_records_value_format(tmp_path):
+    Manifest(levels=[[]], blob_files=[], next_file_number=1, ttl_enabled=True).save(str(tmp_path))
+    assert Manifest.load(str(tmp_path)).ttl_enabled is True
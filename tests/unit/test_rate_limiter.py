@@ -0,0 +1,109 @@
+import os
+import threading
+import time
+import pytest
+from src.storage_engine.memtable.skiplist import SkipList
+from src.storage_engine.sstable.writer import SSTableWriter
+from src.storage_engine.compaction.merger import Compactor
+from src.storage_engine.rate_limiter import RateLimiter, IO_PRIORITY_HIGH, IO_PRIORITY_LOW
+
+
+class RecordingLimiter:
+    """Stand-in limiter that remembers every request."""
+    def __init__(self):
+        self.requests = []
+
+    def request(self, num_bytes, priority=IO_PRIORITY_LOW):
+        self.requests.append((num_bytes, priority))
+
+def test_rate_limiter_throttles_to_configured_rate():
+    # 100 KB/s with a 10 KB bucket: the first 10 KB pass immediately,
+    # the remaining 20 KB take ~0.2s.
+    limiter = RateLimiter(100_000, refill_period=0.1)
+
+    start = time.monotonic()
+    limiter.request(30_000)
+    elapsed = time.monotonic() - start
+
+    assert elapsed >= 0.15
+    assert limiter.bytes_through[IO_PRIORITY_LOW] == 30_000
+
+def test_flush_preempts_compaction():
+    """A high-priority request that arrives later is still served first."""
+    limiter = RateLimiter(10_000, refill_period=0.1)
+    limiter.request(1_000, IO_PRIORITY_HIGH) # Drain the bucket
+    finished = []
+
+    def worker(priority, name):
+        limiter.request(1_000, priority)
+        finished.append(name)
+
+    low = threading.Thread(target=worker, args=(IO_PRIORITY_LOW, "compaction"))
+    high = threading.Thread(target=worker, args=(IO_PRIORITY_HIGH, "flush"))
+    low.start()
+    time.sleep(0.01)
+    high.start()
+    low.join()
+    high.join()
+
+    assert finished == ["flush", "compaction"]
+
+def test_compaction_sleeps_while_flush_waits():
+    """A low-priority request held back by a flush must not poll the condition."""
+    limiter = RateLimiter(1_000_000, refill_period=0.1)
+    limiter.request(100_000, IO_PRIORITY_HIGH) # Drain the bucket
+    wakeups = {"compaction": 0}
+    wait = limiter._cond.wait
+
+    def counting_wait(timeout=None):
+        if threading.current_thread().name == "compaction":
+            wakeups["compaction"] += 1
+        return wait(timeout)
+
+    limiter._cond.wait = counting_wait
+    high = threading.Thread(target=limiter.request, args=(90_000, IO_PRIORITY_HIGH), name="flush")
+    low = threading.Thread(target=limiter.request, args=(1_000, IO_PRIORITY_LOW), name="compaction")
+    high.start()
+    time.sleep(0.01)
+    low.start()
+    high.join()
+    low.join()
+
+    # Woken by the flush finishing, then at most a few refill sleeps
+    assert wakeups["compaction"] <= 5
+    assert limiter.bytes_through[IO_PRIORITY_LOW] == 1_000
+
+def test_auto_tune_follows_compaction_debt():
+    limiter = RateLimiter(1_000_000, auto_tuned=True)
+    start_rate = limiter.rate
+    assert start_rate < limiter.max_rate
+
+    # Debt growing -> more bandwidth, capped at the configured ceiling
+    for debt in range(1, 50):
+        limiter.update_compaction_debt(debt * 1000)
+    assert limiter.rate == limiter.max_rate
+
+    # Debt shrinking -> bandwidth handed back, floored at the minimum
+    for debt in range(49, -1, -1):
+        limiter.update_compaction_debt(debt * 1000)
+    assert limiter.rate == limiter.min_rate
+
+def test_fixed_limiter_ignores_compaction_debt():
+    limiter = RateLimiter(1_000_000)
+    limiter.update_compaction_debt(10**9)
+    assert limiter.rate == 1_000_000
+
+def test_writer_and_compactor_charge_limiter(tmp_path):
+    limiter = RecordingLimiter()
+    mem = SkipList()
+    mem.insert("a", "1")
+    mem.insert("b", "2")
+
+    path = str(tmp_path / "1.sst")
+    SSTableWriter(rate_limiter=limiter).write(mem, path)
+    assert limiter.requests == [(os.path.getsize(path), IO_PRIORITY_HIGH)]
+
+    limiter.requests.clear()
+    out = str(tmp_path / "out.sst")
+    Compactor(rate_limiter=limiter).merge([path], out)
+    assert limiter.requests == [(os.path.getsize(out), IO_PRIORITY_LOW)]
@@ -0,0 +1,40 @@
+import pytest
+from src.storage_engine.cache.row_cache import RowCache
+
+
+def test_row_cache_hit_miss_and_negative_entries():
+    cache = RowCache(capacity_bytes=10_000)
+    cache.put("user:1", "Alice", size=5)
+    cache.put("user:404", None) # Negative entry
+
+    assert cache.get("user:1") == (True, "Alice")
+    assert cache.get("user:404") == (True, None)
+    assert cache.get("user:2") == (False, None)
+
+    assert cache.hits == 2
+    assert cache.negative_hits == 1
+    assert cache.misses == 1
+    assert cache.hit_rate == pytest.approx(2 / 3)
+
+def test_row_cache_evicts_least_recently_used_by_bytes():
+    entry_charge = len("k1") + 100 + RowCache.ENTRY_OVERHEAD
+    cache = RowCache(capacity_bytes=entry_charge * 2)
+    cache.put("k1", "a" * 100, size=100)
+    cache.put("k2", "b" * 100, size=100)
+
+    cache.get("k1") # k2 is now the LRU entry
+    cache.put("k3", "c" * 100, size=100)
+
+    assert cache.get("k2") == (False, None)
+    assert cache.get("k1")[0] and cache.get("k3")[0]
+    assert cache.usage <= cache.capacity
+
+def test_row_cache_invalidate_and_oversized_entries():
+    cache = RowCache(capacity_bytes=200)
+    cache.put("k", "v", size=1)
+    cache.invalidate("k")
+    assert cache.get("k") == (False, None)
+    assert cache.usage == 0
+
+    cache.put("huge", "x" * 1000, size=1000) # Larger than the whole cache
+    assert len(cache) == 0
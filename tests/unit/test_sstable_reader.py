@@ -1,7 +1,11 @@
+import mmap
+import os
 import pytest
 from src.storage_engine.memtable.skiplist import SkipList
 from src.storage_engine.sstable.writer import SSTableWriter
 from src.storage_engine.sstable.reader import SSTableReader
+from src.storage_engine.cache.table_cache import TableCache
+from src.storage_engine.config import READ_MODE_MMAP, READ_MODE_PREAD
 
 
 def test_sstable_reader_finds_data(tmp_path):
@@ -30,3 +34,100 @@ def test_sstable_reader_finds_data(tmp_path):
     assert reader.search("key3") is None
 
     reader.close()
+
+@pytest.fixture
+def large_sst(tmp_path):
+    """Enough records to span many sparse index blocks."""
+    mem = SkipList()
+    for i in range(2000):
+        mem.insert(f"key:{i:05d}", f"value-{i}" * 3)
+    path = str(tmp_path / "large.sst")
+    SSTableWriter().write(mem, path)
+    return path
+
+@pytest.mark.parametrize("read_mode", [READ_MODE_MMAP, READ_MODE_PREAD])
+def test_sstable_reader_read_modes_agree(large_sst, read_mode):
+    reader = SSTableReader(large_sst, read_mode=read_mode)
+
+    assert reader._index_keys is None # Built lazily by the first lookup
+    for i in (0, 1, 777, 1999):
+        assert reader.search(f"key:{i:05d}") == f"value-{i}" * 3
+    assert len(reader._index_keys) > 1
+    assert reader.search("key:00000x") is None # Falls between two keys
+    assert reader.search("a") is None          # Before the first key
+    assert reader.search("zzz") is None        # After the last key
+
+    records = list(reader)
+    assert len(records) == 2000
+    assert records[-1] == ("key:01999", "value-1999" * 3)
+    reader.close()
+
+def test_sstable_reader_borrows_handles_from_table_cache(large_sst, tmp_path):
+    other = str(tmp_path / "other.sst")
+    mem = SkipList()
+    mem.insert("k", "v")
+    SSTableWriter().write(mem, other)
+
+    cache = TableCache(max_open_files=1)
+    readers = [SSTableReader(large_sst, table_cache=cache), SSTableReader(other, table_cache=cache)]
+    for _ in range(3):
+        assert readers[0].search("key:00042") == "value-42" * 3
+        assert readers[1].search("k") == "v"
+    assert len(cache) == 1
+    assert cache.evictions > 0
+
+    # Handles belong to the cache: closing a reader leaves them for others
+    for reader in readers:
+        reader.close()
+    assert len(cache) == 1
+    cache.clear()
+
+def test_sstable_reader_rejects_unknown_read_mode(large_sst):
+    with pytest.raises(ValueError):
+        SSTableReader(large_sst, read_mode="aio")
+
+class RecordingMap:
+    """Wraps a real mapping and records madvise calls (mmap's are read-only)."""
+    def __init__(self, mm):
+        self.mm = mm
+        self.advice = []
+
+    def __getitem__(self, item):
+        return self.mm[item]
+
+    def madvise(self, flag):
+        self.advice.append(flag)
+
+    def close(self):
+        self.mm.close()
+
+@pytest.mark.skipif(not hasattr(mmap, "MADV_RANDOM"), reason="madvise hints unavailable")
+def test_sstable_reader_hints_mmap_access_pattern(large_sst):
+    reader = SSTableReader(large_sst, read_mode=READ_MODE_MMAP)
+    recorder = reader._handle.mm = RecordingMap(reader._handle.mm)
+    sequential = [mmap.MADV_SEQUENTIAL, mmap.MADV_WILLNEED]
+
+    reader.search("key:00042") # Index build scans, then the lookup itself
+    assert recorder.advice == sequential + [mmap.MADV_RANDOM]
+
+    recorder.advice.clear()
+    list(reader)
+    reader.search("key:00043")
+    reader.search("key:00044") # Unchanged pattern: no extra syscall
+    assert recorder.advice == sequential + [mmap.MADV_RANDOM]
+    reader.close()
+
+@pytest.mark.skipif(not hasattr(os, "posix_fadvise"), reason="posix_fadvise unavailable")
+def test_sstable_reader_hints_pread_access_pattern(large_sst, monkeypatch):
+    advice = []
+    monkeypatch.setattr(os, "posix_fadvise", lambda fd, offset, length, flag: advice.append(flag))
+    reader = SSTableReader(large_sst, read_mode=READ_MODE_PREAD)
+
+    reader.search("key:00042")
+    list(reader)
+    assert advice == [
+        os.POSIX_FADV_SEQUENTIAL, os.POSIX_FADV_WILLNEED, # Index build
+        os.POSIX_FADV_RANDOM,                            # Lookup
+        os.POSIX_FADV_SEQUENTIAL, os.POSIX_FADV_WILLNEED, # Scan
+    ]
+    reader.close()
@@ -0,0 +1,58 @@
+from src.storage_engine.cache.table_cache import TableCache
+
+
+class FakeHandle:
+    def __init__(self, name):
+        self.name = name
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def test_table_cache_reuses_open_handles():
+    cache = TableCache(max_open_files=2)
+    first = cache.acquire("a.sst", lambda: FakeHandle("a"))
+    cache.release(first)
+    again = cache.acquire("a.sst", lambda: FakeHandle("a2"))
+    cache.release(again)
+
+    assert again is first
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_table_cache_closes_least_recently_used():
+    cache = TableCache(max_open_files=2)
+    handles = {}
+    for name in ("a", "b", "a", "c"):
+        handle = handles.setdefault(name, cache.acquire(name, lambda n=name: FakeHandle(n)))
+        cache.release(handle)
+
+    # "b" was least recently used when "c" came in
+    assert handles["b"].closed
+    assert not handles["a"].closed and not handles["c"].closed
+    assert len(cache) == 2
+    assert cache.evictions == 1
+
+def test_table_cache_never_closes_pinned_handles():
+    cache = TableCache(max_open_files=1)
+    a = cache.acquire("a", lambda: FakeHandle("a"))
+    b = cache.acquire("b", lambda: FakeHandle("b")) # Both pinned: over capacity
+    assert len(cache) == 2 and not a.closed
+
+    cache.release(a)
+    assert a.closed and not b.closed
+    assert len(cache) == 1
+
+    # A table deleted while in use is closed by its last release
+    cache.evict("b")
+    assert not b.closed and len(cache) == 0
+    cache.release(b)
+    assert b.closed
+
+def test_table_cache_clear_closes_everything():
+    cache = TableCache(max_open_files=4)
+    handles = [cache.acquire(name, lambda n=name: FakeHandle(n)) for name in "abc"]
+    cache.release(handles[0])
+    cache.clear()
+    assert all(h.closed for h in handles)
+    assert len(cache) == 0
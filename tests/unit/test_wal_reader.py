@@ -0,0 +1,44 @@
+import os
+from src.storage_engine.wal.logger import WALLogger
+from src.storage_engine.wal.reader import WALReader
+
+
+def test_wal_reader_replays_records_in_order(tmp_path):
+    path = str(tmp_path / "test.wal")
+    wal = WALLogger(path)
+    wal.append("k1", "v1")
+    wal.append("k2", "v2")
+    wal.close()
+
+    assert list(WALReader(path)) == [("k1", "v1"), ("k2", "v2")]
+
+def test_wal_reader_stops_at_torn_tail_and_resumes(tmp_path):
+    path = str(tmp_path / "test.wal")
+    wal = WALLogger(path)
+    wal.append("k1", "v1")
+    wal.close()
+    complete = os.path.getsize(path)
+    with open(path, "ab") as f:
+        f.write(b"\x00\x00\x00\x02k2\x00\x00") # Half-written record
+
+    reader = WALReader(path)
+    assert list(reader) == [("k1", "v1")]
+    assert reader.offset == complete
+
+    # The writer finishes the record; tailing picks up only the new data
+    with open(path, "ab") as f:
+        f.write(b"\x00\x02v2")
+    assert list(WALReader(path, reader.offset)) == [("k2", "v2")]
+
+def test_wal_reader_skips_rotated_file(tmp_path):
+    path = str(tmp_path / "test.wal")
+    WALLogger(path).close()
+    old_inode = os.stat(path).st_ino
+    os.replace(path, str(tmp_path / "000001.wal"))
+    wal = WALLogger(path)
+    wal.append("k", "v")
+    wal.close()
+
+    reader = WALReader(path, expected_inode=old_inode)
+    assert list(reader) == []
+    assert reader.inode != old_inode
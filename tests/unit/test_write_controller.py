@@ -0,0 +1,42 @@
+import pytest
+from src.storage_engine.config import StorageConfig
+from src.storage_engine.write_controller import WriteController
+
+
+@pytest.fixture
+def controller():
+    config = StorageConfig(
+        level0_slowdown_writes_trigger=4,
+        level0_stop_writes_trigger=8,
+        immutable_memtable_slowdown_trigger=2,
+        immutable_memtable_stop_trigger=3,
+        soft_pending_compaction_bytes_limit=1000,
+        hard_pending_compaction_bytes_limit=2000,
+        max_write_delay=0.1,
+    )
+    return WriteController(config)
+
+def test_no_backpressure_below_thresholds(controller):
+    assert controller.evaluate(3, 1, 999) == (False, 0.0)
+
+def test_delay_grows_gradually_towards_stop(controller):
+    delays = []
+    for l0_files in range(4, 8):
+        stopped, delay = controller.evaluate(l0_files, 0, 0)
+        assert not stopped
+        delays.append(delay)
+
+    # Strictly increasing, never reaching the full delay before the stop threshold
+    assert delays == sorted(delays)
+    assert len(set(delays)) == len(delays)
+    assert 0 < delays[0] and delays[-1] < 0.1
+
+def test_worst_metric_wins(controller):
+    _, l0_only = controller.evaluate(4, 0, 0)
+    _, both = controller.evaluate(4, 0, 1900)
+    assert both > l0_only
+
+@pytest.mark.parametrize("metrics", [(8, 0, 0), (0, 3, 0), (0, 0, 2000)])
+def test_stop_thresholds(controller, metrics):
+    stopped, _ = controller.evaluate(*metrics)
+    assert stopped